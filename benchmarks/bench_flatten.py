@@ -0,0 +1,63 @@
+"""Compare rows per second of the flattening engines and of a process pool
+
+Run with ``poetry run python benchmarks/bench_flatten.py``.
+Every document has a nested object and two arrays of nested objects,
+one of which holds another array, so ``depth=2`` expands three levels.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from pd_extras.extra.flattener import Flattener
+
+SIZE = 20_000
+
+
+def _get_data() -> pd.DataFrame:
+    rng = np.random.default_rng(seed=0)
+    documents = []
+    for idx in range(SIZE):
+        documents.append(
+            {
+                "id": idx,
+                "name": f"name{idx}",
+                "meta": {"score": float(rng.random()), "tags": {"a": 1, "b": 2}},
+                "items": [
+                    {
+                        "sku": int(sku),
+                        "price": float(rng.random()),
+                        "parts": [{"part": part} for part in range(rng.integers(3))],
+                    }
+                    for sku in range(rng.integers(5))
+                ],
+                "events": [{"kind": "view", "at": int(at)} for at in range(3)],
+            }
+        )
+
+    return pd.DataFrame(documents)
+
+
+def main():
+    """Print rows per second of each engine."""
+
+    data = _get_data()
+    for name, engine, n_jobs in [
+        ("pandas", "pandas", 1),
+        ("columnar", "columnar", 1),
+        ("columnar(n_jobs=4)", "columnar", 4),
+    ]:
+        flattener = Flattener(
+            num_rows_to_check=10, depth=2, engine=engine, n_jobs=n_jobs
+        )
+        began = time.perf_counter()
+        flat_data = flattener.flatten(data=data)
+        seconds = time.perf_counter() - began
+        print(
+            f"{name:<20}{data.shape[0] / seconds:>15,.0f} rows/s"
+            f"{flat_data.shape[0]:>12,} output rows"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare documents per second of ``to_dict("records")`` and ``encode_documents``
+
+Run with ``poetry run python benchmarks/bench_mongo_encoding.py``.
+Adding an ``_id`` and encoding to BSON is included for every path,
+because that is the work pymongo does before sending.
+"""
+
+import time
+
+import bson
+import numpy as np
+import pandas as pd
+from pd_extras.extra.operations import generate_random_dataframe
+from pd_extras.write.nosql_writer import encode_documents
+
+SIZE = 200_000
+BATCH_SIZE = 10_000
+
+
+def _get_data() -> pd.DataFrame:
+    data = generate_random_dataframe(num_int_cols=4, num_float_cols=4, size=SIZE)
+    data.loc[data.sample(frac=0.1, random_state=0).index, "float5"] = np.nan
+    data["time"] = pd.date_range("2023-01-01", periods=SIZE, freq="s")
+    data["category"] = pd.Categorical(np.random.choice(["a", "b", "c"], size=SIZE))
+
+    return data
+
+
+def _to_dict_records(data: pd.DataFrame) -> int:
+    count = 0
+    for start in range(0, data.shape[0], BATCH_SIZE):
+        for document in data.iloc[start : start + BATCH_SIZE].to_dict("records"):
+            document["category"] = str(document["category"])
+            document["_id"] = bson.ObjectId()
+            bson.encode(document)
+            count += 1
+
+    return count
+
+
+def _encode_documents(data: pd.DataFrame) -> int:
+    count = 0
+    for documents in encode_documents(data=data, batch_size=BATCH_SIZE):
+        for document in documents:
+            document["_id"] = bson.ObjectId()
+            bson.encode(document)
+            count += 1
+
+    return count
+
+
+def _encode_raw_bson(data: pd.DataFrame) -> int:
+    count = 0
+    for documents in encode_documents(data=data, batch_size=BATCH_SIZE, raw_bson=True):
+        count += len(documents)
+
+    return count
+
+
+def main():
+    """Print documents per second of each path."""
+
+    data = _get_data()
+    for name, func in [
+        ('to_dict("records")', _to_dict_records),
+        ("encode_documents", _encode_documents),
+        ("encode_documents(raw_bson=True)", _encode_raw_bson),
+    ]:
+        began = time.perf_counter()
+        count = func(data)
+        seconds = time.perf_counter() - began
+        print(f"{name:<35}{count / seconds:>15,.0f} documents/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 """Check sanity of dataframes"""
 
 import re
+import weakref
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
+_illegal_chars = re.compile(pattern="[^a-zA-Z0-9]")
+
+_position_maps: dict = {}
+
 
 def check_if_column_exists(column: str, data: pd.DataFrame):
     """Check the column exists in the dataframe.
@@ -24,27 +31,57 @@ def check_if_column_exists(column: str, data: pd.DataFrame):
         raise ValueError(f"{column} not found in {columns}")
 
 
-def check_if_columns_exist(columns: list, data: pd.DataFrame):
+def _get_position_map(columns: pd.Index) -> dict:
+    """Get the mapping of names to positions of `columns`, built once
+    per ``pd.Index`` object and dropped when the index is garbage collected.
+    """
+
+    key = id(columns)
+    entry = _position_maps.get(key)
+    if entry is not None and entry[0]() is columns:
+        return entry[1]
+
+    positions = {column: idx for idx, column in enumerate(columns)}
+    _position_maps[key] = (weakref.ref(columns), positions)
+    weakref.finalize(columns, _position_maps.pop, key, None)
+
+    return positions
+
+
+def check_if_columns_exist(columns: list, data: pd.DataFrame) -> np.ndarray:
     """Check the column exists in the dataframe.
     Usually used to cross-check against a dataframe.
+    Columns are looked up in a map of names to positions, which is built
+    once per column index of `data`, so repeated checks on the same
+    dataframe do not scan its columns again.
 
     :param columns: List of columns
     :type columns: ``list``
     :param data: Dataframe object to check against.
     :type data: ``pd.DataFrame``
-    :raises ValueError: If any of the columns is not found in the dataframe.
+    :raises ValueError: With every column not found in the dataframe.
+    :return: Positions of the columns in the dataframe.
+    :rtype: ``np.ndarray``
 
     >>> from pandas_utils.check.sanitize import check_if_columns_exist
     >>> check_if_columns_exist(columns=["col_rand1", "col_ran2"], data=data)
     """
 
-    for column in columns:
-        if column not in data.columns:
-            raise ValueError(f"{column} not found in {data.columns}")
+    position_map = _get_position_map(columns=data.columns)
+    positions = np.array(
+        [position_map.get(column, -1) for column in columns], dtype=np.intp
+    )
+
+    missing = [column for column, idx in zip(columns, positions) if idx < 0]
+    if missing:
+        raise ValueError(f"{missing} not found in {data.columns}")
+
+    return positions
 
 
 def clean_column(column: str, is_lower: bool = True, default_char: str = "") -> str:
     """Clean a column name.
+    Results are memoized per `column`, `is_lower` and `default_char`.
 
     :param column: Name of column.
     :type column: ``str``
@@ -64,12 +101,41 @@ def clean_column(column: str, is_lower: bool = True, default_char: str = "") ->
     >>> )
     """
 
+    return _clean_column(column, is_lower, default_char)
+
+
+@lru_cache(maxsize=65536)
+def _clean_column(column: str, is_lower: bool, default_char: str) -> str:
     if is_lower:
         column = column.lower()
 
-    pattern = "[^a-zA-Z0-9]"
+    return _illegal_chars.sub(repl=default_char, string=column)
+
+
+def check_column_collisions(columns: list, clean_columns: list):
+    """Check that no two different columns get the same clean name.
+
+    :param columns: Original column names.
+    :type columns: ``list``
+    :param clean_columns: Clean column names, in the same order.
+    :type clean_columns: ``list``
+    :raises ValueError: With every clean name shared by different columns.
+
+    >>> from pandas_utils.check.sanitize import check_column_collisions
+    >>> check_column_collisions(columns=["A b", "a_b"], clean_columns=["ab", "ab"])
+    """
+
+    sources: dict = {}
+    for column, clean_column in zip(columns, clean_columns):
+        sources.setdefault(clean_column, []).append(column)
 
-    return re.sub(pattern=pattern, repl=default_char, string=column)
+    collisions = {
+        clean_column: names
+        for clean_column, names in sources.items()
+        if len(set(names)) > 1
+    }
+    if collisions:
+        raise ValueError(f"Different columns have the same clean name: {collisions}")
 
 
 def clean_column_names(
@@ -86,6 +152,7 @@ def clean_column_names(
     :param default_char: What to replace illegal characters with, defaults to "".
         Another great choice is "_".
     :type default_char: ``str, optional``
+    :raises ValueError: If different columns get the same clean name.
     :return: Dataframe with clean column names.
     :rtype: ``pd.DataFrame``
 
@@ -93,13 +160,11 @@ def clean_column_names(
     >>> res: pd.DataFrame = clean_column_names(data=data)
     """
 
-    data.columns = [
-        clean_column(
-            column=column,
-            is_lower=is_lower,
-            default_char=default_char,
-        )
-        for column in data.columns
+    columns = data.columns.tolist()
+    clean_columns = [
+        _clean_column(column, is_lower, default_char) for column in columns
     ]
+    check_column_collisions(columns=columns, clean_columns=clean_columns)
+    data.columns = clean_columns
 
     return data
@@ -1,10 +1,335 @@
 """Flatten dataframes"""
 
+import json
+import os
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Union
+from itertools import islice
+from operator import itemgetter
+from typing import Iterable, Optional, Union
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import (  # type: ignore
+    infer_dtype,
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_numeric_dtype,
+)
+
+engines = ["columnar", "pandas"]
+samplings = ["head", "random", "stratified"]
+
+_mixed_types = ["mixed", "mixed-integer"]
+_get_type = np.frompyfunc(type, 1, 1)
+_get_length = np.frompyfunc(len, 1, 1)
+_get_first = np.frompyfunc(itemgetter(0), 1, 1)
+
+
+def _iter_records(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as file:
+            yield from _iter_records(source=file)
+    elif hasattr(source, "read"):
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        yield from source
+
+
+def _iter_chunks(source, chunksize: int):
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, source.shape[0], chunksize):
+            yield source.iloc[start : start + chunksize]
+        return
+
+    records = _iter_records(source=source)
+    while True:
+        chunk = list(islice(records, chunksize))
+        if not chunk:
+            break
+
+        yield pd.DataFrame(data=chunk)
+
+
+def _is_arrow_column(series: pd.Series) -> bool:
+    if series.dtype == np.dtype("O"):
+        return infer_dtype(series, skipna=False) == "string"
+
+    return (
+        is_numeric_dtype(series.dtype)
+        or is_bool_dtype(series.dtype)
+        or is_datetime64_any_dtype(series.dtype)
+    )
+
+
+def _pack_partition(data: pd.DataFrame) -> tuple:
+    positions = [
+        idx for idx in range(data.shape[1]) if _is_arrow_column(data.iloc[:, idx])
+    ]
+    arrow_data = data.iloc[:, positions].reset_index(drop=True)
+    arrow_data.columns = [str(idx) for idx in positions]
+    batch = pa.RecordBatch.from_pandas(arrow_data, preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+    arrow_positions = set(positions)
+    objects = {
+        idx: data.iloc[:, idx].to_numpy()
+        for idx in range(data.shape[1])
+        if idx not in arrow_positions
+    }
+
+    return (
+        data.columns.tolist(),
+        data.shape[0],
+        sink.getvalue().to_pybytes(),
+        pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+
+def _unpack_partition(partition: tuple) -> pd.DataFrame:
+    names, num_rows, arrow_bytes, object_bytes = partition
+    arrow_data = pa.ipc.open_stream(arrow_bytes).read_all().to_pandas()
+    objects = pickle.loads(object_bytes)
+
+    data = pd.DataFrame(
+        {
+            idx: objects[idx] if idx in objects else arrow_data[str(idx)]
+            for idx in range(len(names))
+        },
+        index=pd.RangeIndex(num_rows),
+    )
+    data.columns = names
+
+    return data
+
+
+def _to_object_array(values) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    for idx, value in enumerate(values):
+        array[idx] = value
+
+    return array
+
+
+def _flatten_dict(value: dict, prefix: str, sep: str, items: list) -> list:
+    for key, item in value.items():
+        name = f"{prefix}{sep}{key}"
+        if isinstance(item, dict):
+            _flatten_dict(value=item, prefix=name, sep=sep, items=items)
+        else:
+            items.append((name, item))
+
+    return items
+
+
+def _flatten_record(record: dict, sep: str) -> list:
+    items = [
+        (key, value) for key, value in record.items() if not isinstance(value, dict)
+    ]
+    for key, value in record.items():
+        if isinstance(value, dict):
+            _flatten_dict(value=value, prefix=str(key), sep=sep, items=items)
+
+    return items
+
+
+def _normalize_columns(columns: dict, num_rows: int, sep: str) -> dict:
+    """Flatten dict values of `columns` into one column per leaf,
+    ordered like ``pd.json_normalize`` orders the keys of its records.
+    """
+
+    names = list(columns.keys())
+    dict_masks = {}
+    for name, values in columns.items():
+        mask = np.fromiter(
+            (isinstance(value, dict) for value in values), dtype=bool, count=num_rows
+        )
+        if mask.any():
+            dict_masks[name] = mask
+
+    if not dict_masks:
+        return columns
+
+    flat_columns: dict = {}
+    order: dict = {}
+    signatures: set = set()
+    dict_names = list(dict_masks.keys())
+
+    for row in range(num_rows):
+        dicts = tuple(name for name in dict_names if dict_masks[name][row])
+        keys = []
+        for name in dicts:
+            for key, value in _flatten_dict(
+                value=columns[name][row], prefix=name, sep=sep, items=[]
+            ):
+                if key not in flat_columns:
+                    flat_columns[key] = np.full(num_rows, np.nan, dtype=object)
+                flat_columns[key][row] = value
+                keys.append(key)
+
+        signature = (dicts, tuple(keys))
+        if signature not in signatures:
+            signatures.add(signature)
+            for name in names:
+                if name not in dicts:
+                    order.setdefault(name)
+            for key in keys:
+                order.setdefault(key)
+
+    normalized = {}
+    for name in order:
+        if name in flat_columns:
+            normalized[name] = flat_columns[name]
+        elif name in dict_masks:
+            values = columns[name].copy()
+            values[dict_masks[name]] = np.nan
+            normalized[name] = values
+        else:
+            normalized[name] = columns[name]
+
+    return normalized
+
+
+def _is_subclass(types: np.ndarray, base: type) -> np.ndarray:
+    mask = np.zeros(types.shape, dtype=bool)
+    for value_type in set(types.tolist()):
+        if issubclass(value_type, base):
+            mask |= types == value_type
+
+    return mask
+
+
+def _count_nesting(values: np.ndarray) -> tuple:
+    """Count dicts and non-empty lists starting with a dict in `values`.
+    Values are probed by type codes, so columns ``infer_dtype`` finds
+    to hold a single scalar type are not looked at value by value.
+
+    :return: Number of dicts and number of lists of dicts.
+    """
+
+    if infer_dtype(values, skipna=True) not in _mixed_types:
+        return 0, 0
+
+    types = _get_type(values)
+    num_dicts = int(_is_subclass(types=types, base=dict).sum())
+
+    lists = values[_is_subclass(types=types, base=list)]
+    lists = lists[_get_length(lists).astype(bool)]
+    if lists.shape[0] == 0:
+        return num_dicts, 0
+
+    first_types = _get_type(_get_first(lists))
+
+    return num_dicts, int(_is_subclass(types=first_types, base=dict).sum())
+
+
+def _pull_records(value, name: str) -> list:
+    if isinstance(value, list):
+        return value
+    if pd.isnull(value):
+        return []
+
+    raise TypeError(
+        f"{value} has non list value for path {name}. Must be list or null."
+    )
+
+
+def _expand_column(values: np.ndarray, name: str, prefix: str) -> tuple:
+    """Flatten the list of records in each row of `values` into child columns.
+
+    :return: Number of records per row and child columns with one value per record.
+    """
+
+    records = [_pull_records(value=value, name=name) for value in values]
+    counts = np.fromiter(
+        (len(rows) for rows in records), dtype=np.int64, count=len(records)
+    )
+
+    num_records = int(counts.sum())
+    # Like ``pd.DataFrame``, flattened records are only split into
+    # columns when the first one is a mapping.
+    first = next((rows[0] for rows in records if rows), None)
+    as_records = isinstance(first, dict)
+
+    child_columns: dict = {}
+    position = 0
+    for rows in records:
+        for record in rows:
+            if isinstance(record, dict):
+                items = _flatten_record(record=record, sep=".")
+                items = items if as_records else [("0", dict(items))]
+            else:
+                items = [("0", record)]
+            for key, value in items:
+                key = f"{prefix}{key}"
+                if key not in child_columns:
+                    child_columns[key] = np.full(num_records, np.nan, dtype=object)
+                child_columns[key][position] = value
+            position += 1
+
+    return counts, child_columns
+
+
+def _expand_columns(columns: dict, nested: list, sep: str) -> tuple:
+    """Replace the `nested` columns by their child columns. Rows of each parent
+    are the product of its records over all nested columns, in column order,
+    with a single row of missing values for a column without records.
+    Clashing column names get the ``_x`` and ``_y`` suffixes of ``pd.merge``.
+    """
+
+    expansions = [
+        _expand_column(values=columns[name], name=name, prefix=f"{name}{sep}")
+        for name in nested
+    ]
+
+    sizes = [np.maximum(counts, 1) for counts, _ in expansions]
+    row_sizes = np.prod(sizes, axis=0)
+    num_rows = int(row_sizes.sum())
+
+    parent_index = np.repeat(np.arange(row_sizes.shape[0]), row_sizes)
+    offsets = np.arange(num_rows) - np.repeat(
+        np.cumsum(row_sizes) - row_sizes, row_sizes
+    )
+
+    expanded = {
+        name: values.take(parent_index)
+        for name, values in columns.items()
+        if name not in nested
+    }
+
+    stride = np.ones_like(row_sizes)
+    child_indexes = []
+    for (counts, _), size in reversed(list(zip(expansions, sizes))):
+        index = (offsets // stride[parent_index]) % size[parent_index]
+        start = (np.cumsum(counts) - counts)[parent_index]
+        child_indexes.append(np.where(counts[parent_index] > 0, start + index, -1))
+        stride = stride * size
+    child_indexes.reverse()
+
+    for (_, child_columns), child_index in zip(expansions, child_indexes):
+        overlap = set(expanded).intersection(child_columns)
+        if overlap:
+            expanded = {
+                f"{key}_x" if key in overlap else key: values
+                for key, values in expanded.items()
+            }
+
+        has_record = child_index >= 0
+        for key, values in child_columns.items():
+            column = np.full(num_rows, np.nan, dtype=object)
+            column[has_record] = values[child_index[has_record]]
+            expanded[f"{key}_y" if key in overlap else key] = column
+
+    return expanded, num_rows
 
 
 @dataclass
@@ -17,11 +342,129 @@ class Flattener:
     >>> flat_data = flattener.flatten(data=data)
     >>> # Check whether a column has nested data or not
     >>> column_info = flattener.get_column_info(data=data)
+
+    `engine` chooses how nested columns are expanded. ``"columnar"`` builds
+    every level from object arrays with vectorized index arithmetic while
+    ``"pandas"`` uses ``pd.json_normalize`` and ``pd.merge``. Both return the
+    same dataframe.
+
+    `sampling` chooses the rows checked for nested data: the first
+    `num_rows_to_check` rows (``"head"``), rows drawn at random (``"random"``)
+    or one random row from each of `num_rows_to_check` equal slices of the
+    dataframe (``"stratified"``). `random_state` seeds the draws.
+
+    With `n_jobs` above 1, dataframes are split into up to `n_jobs` partitions
+    of rows which are flattened in a process pool. Partitions have at least
+    `min_partition_rows` rows and there is at most one per CPU, so smaller
+    dataframes are flattened in the current process.
+
+    With `cache_kinds`, the nesting kind of every column is cached per
+    column names and dtypes, so frames with the same schema are only probed
+    once. Only use it when such frames also hold the same kind of values,
+    like chunks of one source: a column that holds lists of dicts in one
+    frame and strings in the next is still expanded as a list.
     """
 
     num_rows_to_check: int
     depth: int = field(default=1)
     sep: str = field(default=".")
+    engine: str = field(default="columnar")
+    sampling: str = field(default="head")
+    random_state: Optional[int] = field(default=None)
+    n_jobs: int = field(default=1)
+    min_partition_rows: int = field(default=10_000)
+    cache_kinds: bool = field(default=False)
+
+    def __post_init__(self):
+        if self.engine not in engines:
+            raise ValueError(f"engine must be one of {engines}, got {self.engine}")
+        if self.sampling not in samplings:
+            raise ValueError(
+                f"sampling must be one of {samplings}, got {self.sampling}"
+            )
+        if self.n_jobs < 1:
+            raise ValueError(f"`n_jobs` must be positive, got {self.n_jobs}")
+        if self.n_jobs > 1 and self.engine != "columnar":
+            raise ValueError("`n_jobs` is only supported by the columnar engine")
+        if self.min_partition_rows < 1:
+            raise ValueError(
+                f"`min_partition_rows` must be positive, got {self.min_partition_rows}"
+            )
+
+        self.__rng = np.random.default_rng(seed=self.random_state)
+        self.__column_kinds: dict = {}
+
+    def _get_sample_rows(self, num_rows: int) -> Union[slice, np.ndarray]:
+        num_samples = min(self.num_rows_to_check, num_rows)
+        if self.sampling == "head" or num_samples == num_rows:
+            return slice(0, num_samples)
+        if self.sampling == "random":
+            return np.sort(self.__rng.choice(num_rows, size=num_samples, replace=False))
+
+        bounds = np.linspace(0, num_rows, num_samples + 1).astype(np.int64)
+        return self.__rng.integers(bounds[:-1], bounds[1:])
+
+    def _probe_column_kinds(self, columns: Iterable, num_rows: int) -> list:
+        rows = self._get_sample_rows(num_rows=num_rows)
+        kinds = []
+        for values in columns:
+            num_dicts, num_lists = (
+                (0, 0) if values is None else _count_nesting(values=values[rows])
+            )
+            if (num_dicts + num_lists) * 2 < self.num_rows_to_check:
+                kinds.append(None)
+            else:
+                kinds.append("dict" if num_dicts >= num_lists else "list")
+
+        return kinds
+
+    def _get_column_kinds(self, key: tuple, columns: Iterable, num_rows: int) -> list:
+        if not self.cache_kinds:
+            return self._probe_column_kinds(columns=columns, num_rows=num_rows)
+
+        kinds = self.__column_kinds.get(key)
+        if kinds is None:
+            kinds = self._probe_column_kinds(columns=columns, num_rows=num_rows)
+            if len(self.__column_kinds) >= 128:
+                self.__column_kinds.pop(next(iter(self.__column_kinds)))
+            self.__column_kinds[key] = kinds
+
+        return list(kinds)
+
+    def _get_nested_columns(self, columns: dict) -> list:
+        kinds = self._get_column_kinds(
+            key=(self.num_rows_to_check, tuple(columns.keys())),
+            columns=columns.values(),
+            num_rows=len(next(iter(columns.values()))) if columns else 0,
+        )
+
+        return [name for name, kind in zip(columns.keys(), kinds) if kind]
+
+    def get_column_kinds(self, data: pd.DataFrame) -> list:
+        """Get how each column of `data` is nested.
+        Only object columns can hold nested data. Their sampled values are
+        probed by type codes and columns of a single scalar type are skipped.
+        With `cache_kinds`, the result is cached per column names and dtypes.
+
+        :param data: Dataframe to check.
+        :type data: ``pd.DataFrame``
+        :return: List with ``"dict"`` for columns of mostly dicts,
+            ``"list"`` for columns of mostly lists of dicts and None otherwise.
+        :rtype: ``list``
+        """
+
+        return self._get_column_kinds(
+            key=(
+                self.num_rows_to_check,
+                tuple(data.columns),
+                tuple(str(dtype) for dtype in data.dtypes),
+            ),
+            columns=(
+                data.iloc[:, idx].to_numpy() if dtype == np.dtype("O") else None
+                for idx, dtype in enumerate(data.dtypes)
+            ),
+            num_rows=data.shape[0],
+        )
 
     def get_column_info(self, data: pd.DataFrame) -> list:
         """Check whether a certain column is nested or not.
@@ -47,23 +490,7 @@ class Flattener:
 
             return column_info
 
-        rows = data.iloc[: self.num_rows_to_check]
-        for column in data.columns:
-            values = rows[column].to_numpy()
-            num_nested = 0
-
-            for value in values:
-                if isinstance(value, dict):
-                    num_nested += 1
-                elif isinstance(value, list) and len(value) > 0:
-                    if isinstance(value[0], dict):
-                        num_nested += 1
-            if num_nested * 2 >= self.num_rows_to_check:
-                column_info.append(True)
-            else:
-                column_info.append(False)
-
-        return column_info
+        return [kind is not None for kind in self.get_column_kinds(data=data)]
 
     def _flatten(
         self, data: Union[pd.DataFrame, dict], depth: int = 0, depth_cur: int = 0
@@ -109,6 +536,61 @@ class Flattener:
 
         return self._flatten(data=flat_data, depth=depth, depth_cur=depth_cur + 1)
 
+    def _get_columns(self, data: Union[pd.DataFrame, dict]) -> tuple:
+        """Split `data` into object arrays, one per column.
+
+        :return: Columns, number of rows and the separator of the first level.
+        """
+
+        if isinstance(data, dict):
+            columns = {key: _to_object_array([value]) for key, value in data.items()}
+            return columns, 1, "."
+
+        columns = {
+            name: data.iloc[:, idx].to_numpy(dtype=object)
+            for idx, name in enumerate(data.columns)
+        }
+
+        return columns, data.shape[0] if data.shape[1] > 0 else 0, self.sep
+
+    def _flatten_columnar(
+        self,
+        data: Union[pd.DataFrame, dict],
+        depth: int = 0,
+        levels: Optional[list] = None,
+        infer: bool = True,
+    ) -> pd.DataFrame:
+        columns, num_rows, sep = self._get_columns(data=data)
+        if num_rows == 0:
+            return pd.DataFrame()
+
+        depth_cur = 0
+        while True:
+            columns = _normalize_columns(columns=columns, num_rows=num_rows, sep=sep)
+            if depth <= depth_cur or depth < 1:
+                break
+
+            if levels is not None and depth_cur < len(levels):
+                nested = [name for name in levels[depth_cur] if name in columns]
+            else:
+                nested = self._get_nested_columns(columns=columns)
+                if levels is not None:
+                    levels.append(nested)
+            if not nested:
+                break
+
+            columns, num_rows = _expand_columns(
+                columns=columns, nested=nested, sep=self.sep
+            )
+            if not columns:
+                return pd.DataFrame()
+            sep = self.sep
+            depth_cur += 1
+
+        flat_data = pd.DataFrame(columns, index=pd.RangeIndex(num_rows))
+
+        return flat_data.infer_objects() if infer else flat_data
+
     def flatten(self, data: Union[dict, pd.DataFrame]) -> pd.DataFrame:
         """Return a normalized dataframe.
 
@@ -118,4 +600,336 @@ class Flattener:
         :rtype: ``pd.DataFrame``
         """
 
-        return self._flatten(data=data, depth=self.depth, depth_cur=0)
+        if self.engine == "pandas":
+            return self._flatten(data=data, depth=self.depth, depth_cur=0)
+        if self.n_jobs > 1 and isinstance(data, pd.DataFrame):
+            return self._parallel_flatten(data=data)
+
+        return self._flatten_columnar(data=data, depth=self.depth)
+
+    def _flatten_partition(self, partition: tuple, levels: list) -> pd.DataFrame:
+        return self._flatten_columnar(
+            data=_unpack_partition(partition=partition),
+            depth=self.depth,
+            levels=levels,
+            infer=False,
+        )
+
+    def _parallel_flatten(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Flatten partitions of rows in a process pool.
+        Nested columns of every level are found on the first
+        `num_rows_to_check` rows, which expand into the first rows
+        of each level, so all partitions expand the same columns.
+        Numeric, boolean, datetime and string columns are sent to the workers
+        as an Arrow IPC stream. Other object columns are pickled: Arrow would
+        add missing keys of nested dicts as nulls and store tuples as lists,
+        so they would not flatten like they do in a single process.
+        At most one partition per CPU is used and every partition has at least
+        `min_partition_rows` rows, so small dataframes are flattened serially.
+        """
+
+        num_partitions = min(
+            self.n_jobs,
+            os.cpu_count() or 1,
+            data.shape[0] // self.min_partition_rows,
+        )
+        if num_partitions < 2:
+            return self._flatten_columnar(data=data, depth=self.depth)
+
+        levels: list = []
+        self._flatten_columnar(
+            data=data.iloc[: self.num_rows_to_check], depth=self.depth, levels=levels
+        )
+
+        partitions = [
+            _pack_partition(data=data.iloc[rows[0] : rows[-1] + 1])
+            for rows in np.array_split(np.arange(data.shape[0]), num_partitions)
+        ]
+        with ProcessPoolExecutor(max_workers=num_partitions) as executor:
+            flat_data = list(
+                executor.map(
+                    self._flatten_partition, partitions, [levels] * len(partitions)
+                )
+            )
+
+        flat_data = [frame for frame in flat_data if frame.shape[1] > 0]
+        if not flat_data:
+            return pd.DataFrame()
+
+        return pd.concat(flat_data, ignore_index=True, sort=False).infer_objects()
+
+    def _add_tables(
+        self,
+        tables: dict,
+        name: str,
+        columns: dict,
+        num_rows: int,
+        sep: str,
+        key: str,
+        parent_key: str,
+        parent_keys: Optional[np.ndarray] = None,
+        depth_cur: int = 0,
+    ) -> None:
+        columns = _normalize_columns(columns=columns, num_rows=num_rows, sep=sep)
+        if key in columns or parent_key in columns:
+            raise ValueError(
+                f"Table {name} already has a column named {key} or {parent_key}"
+            )
+
+        nested = []
+        if depth_cur < self.depth and columns:
+            nested = self._get_nested_columns(columns=columns)
+
+        table = {key: np.arange(num_rows)}
+        if parent_keys is not None:
+            table[parent_key] = parent_keys
+        for column, values in columns.items():
+            if column not in nested:
+                table[column] = values
+        tables[name] = pd.DataFrame(table).infer_objects()
+
+        for column in nested:
+            counts, child_columns = _expand_column(
+                values=columns[column], name=column, prefix=""
+            )
+            self._add_tables(
+                tables=tables,
+                name=column if parent_keys is None else f"{name}{self.sep}{column}",
+                columns=child_columns,
+                num_rows=int(counts.sum()),
+                sep=self.sep,
+                key=key,
+                parent_key=parent_key,
+                parent_keys=np.repeat(np.arange(num_rows), counts),
+                depth_cur=depth_cur + 1,
+            )
+
+    def flatten_to_tables(
+        self,
+        data: Union[dict, pd.DataFrame],
+        name: str = "root",
+        key: str = "__row_id",
+        parent_key: str = "__parent_row_id",
+    ) -> dict:
+        """Return `data` normalized into a parent table and one child table
+        per nested array, up to `depth` levels deep. Instead of one row per
+        combination of records of sibling arrays, each record is one row of
+        its own table, so the number of rows grows linearly with the data.
+        Every table has a `key` column numbering its rows and every child
+        table has a `parent_key` column with the `key` of its parent row.
+
+        :param data: Pandas dataframe or a single record to normalize.
+        :type data: ``pd.DataFrame`` or ``dict``
+        :param name: Name of the parent table, defaults to "root".
+        :type name: ``str``, optional
+        :param key: Name of the row number column, defaults to "__row_id".
+        :type key: ``str``, optional
+        :param parent_key: Name of the parent row number column,
+            defaults to "__parent_row_id".
+        :type parent_key: ``str``, optional
+        :raises ValueError: If a table already has a `key` or `parent_key` column.
+        :return: Mapping of table names to dataframes, parents first.
+            Child tables are named by the path of their array,
+            like ``batters.batter``.
+        :rtype: ``dict``
+
+        >>> tables = flattener.flatten_to_tables(data=data)
+        >>> for table_name, table in tables.items():
+        >>>     conn.write_df_to_db(data=table, table_name=table_name)
+        """
+
+        columns, num_rows, sep = self._get_columns(data=data)
+        tables: dict = {}
+        self._add_tables(
+            tables=tables,
+            name=name,
+            columns=columns,
+            num_rows=num_rows,
+            sep=sep,
+            key=key,
+            parent_key=parent_key,
+        )
+
+        return tables
+
+    def iter_flatten(
+        self,
+        source: Union[pd.DataFrame, str, os.PathLike, Iterable[dict]],
+        chunksize: int = 10_000,
+        columns: Optional[list] = None,
+    ):
+        """Flatten newline delimited JSON or records chunk by chunk,
+        so only one chunk of records is held in memory at a time.
+        Nested columns are taken from the first chunk. The output columns are
+        `columns` if given and the columns of the first chunk otherwise, and
+        every chunk is reindexed to them: columns missing from a chunk are
+        filled with NaN and other columns are dropped. Without `columns`,
+        a ``UserWarning`` names the columns of later chunks that are dropped.
+        Chunks are always flattened by the ``"columnar"`` engine.
+
+        :param source: Dataframe, path of a newline delimited JSON file,
+            a file object of such lines or an iterable of records.
+        :type source: ``pd.DataFrame``, ``str``, ``os.PathLike``, file object
+            or ``Iterable[dict]``
+        :param chunksize: Number of records per chunk, defaults to 10_000.
+        :type chunksize: ``int``, optional
+        :param columns: Flattened columns of every chunk, like ``["id", "s.a"]``,
+            defaults to the columns of the first chunk.
+        :type columns: ``list``, optional
+        :return: Generator of flat dataframes, one per chunk of records.
+        :rtype: ``Iterator[pd.DataFrame]``
+
+        >>> for chunk in flattener.iter_flatten(source="export.ndjson"):
+        >>>     conn.write_df_to_db(data=chunk, table_name=table_name)
+        """
+
+        if chunksize < 1:
+            raise ValueError(f"`chunksize` must be positive, got {chunksize}")
+
+        levels: list = []
+        schema = None if columns is None else pd.Index(columns)
+        for chunk in _iter_chunks(source=source, chunksize=chunksize):
+            flat_data = self._flatten_columnar(
+                data=chunk, depth=self.depth, levels=levels
+            )
+            if schema is None:
+                schema = flat_data.columns
+            elif not flat_data.columns.equals(schema):
+                dropped = flat_data.columns.difference(schema, sort=False)
+                if columns is None and len(dropped) > 0:
+                    warnings.warn(
+                        f"Columns {dropped.tolist()} are not in the first chunk "
+                        "and are dropped, pass `columns` to keep them",
+                        UserWarning,
+                        stacklevel=2,
+                    )
+                flat_data = flat_data.reindex(columns=schema)
+
+            yield flat_data
+
+    def iter_arrow_batches(
+        self,
+        source: Union[pd.DataFrame, str, os.PathLike, Iterable[dict]],
+        chunksize: int = 10_000,
+        columns: Optional[list] = None,
+    ):
+        """Flatten `source` chunk by chunk like `iter_flatten`
+        and convert every chunk to an Arrow record batch.
+        The Arrow schema is inferred once from the first chunk.
+        Columns without any value in the first chunk are typed as strings
+        and their later values are converted with ``str``.
+
+        :param source: Dataframe, path of a newline delimited JSON file,
+            a file object of such lines or an iterable of records.
+        :type source: ``pd.DataFrame``, ``str``, ``os.PathLike``, file object
+            or ``Iterable[dict]``
+        :param chunksize: Number of records per chunk, defaults to 10_000.
+        :type chunksize: ``int``, optional
+        :param columns: Flattened columns of every chunk, see `iter_flatten`,
+            defaults to the columns of the first chunk.
+        :type columns: ``list``, optional
+        :raises pa.ArrowInvalid: If values of a later chunk do not fit the schema.
+        :return: Generator of record batches, one per chunk of records.
+        :rtype: ``Iterator[pa.RecordBatch]``
+        """
+
+        schema = None
+        string_columns: list = []
+        for flat_data in self.iter_flatten(
+            source=source, chunksize=chunksize, columns=columns
+        ):
+            if schema is None:
+                schema = pa.Schema.from_pandas(
+                    flat_data, preserve_index=False
+                ).remove_metadata()
+                for idx, arrow_field in enumerate(schema):
+                    if pa.types.is_null(arrow_field.type):
+                        schema = schema.set(idx, arrow_field.with_type(pa.string()))
+                        string_columns.append(flat_data.columns[idx])
+
+            for column in string_columns:
+                values = flat_data[column]
+                flat_data[column] = values.where(values.isna(), values.astype(str))
+
+            yield pa.RecordBatch.from_pandas(
+                flat_data, schema=schema, preserve_index=False
+            )
+
+    def flatten_to_arrow(
+        self,
+        source: Union[pd.DataFrame, str, os.PathLike, Iterable[dict]],
+        chunksize: int = 10_000,
+        columns: Optional[list] = None,
+    ) -> pa.Table:
+        """Return the flattened `source` as an Arrow table.
+        Chunks are converted one at a time, see `iter_arrow_batches`,
+        so the whole flattened dataframe never exists in memory.
+
+        :param source: Dataframe, path of a newline delimited JSON file,
+            a file object of such lines or an iterable of records.
+        :type source: ``pd.DataFrame``, ``str``, ``os.PathLike``, file object
+            or ``Iterable[dict]``
+        :param chunksize: Number of records per chunk, defaults to 10_000.
+        :type chunksize: ``int``, optional
+        :param columns: Flattened columns of every chunk, see `iter_flatten`,
+            defaults to the columns of the first chunk.
+        :type columns: ``list``, optional
+        :return: Arrow table with one record batch per chunk.
+        :rtype: ``pa.Table``
+        """
+
+        batches = list(
+            self.iter_arrow_batches(source=source, chunksize=chunksize, columns=columns)
+        )
+        if not batches:
+            return pa.table({})
+
+        return pa.Table.from_batches(batches)
+
+    def flatten_to_parquet(
+        self,
+        source: Union[pd.DataFrame, str, os.PathLike, Iterable[dict]],
+        path: Union[str, os.PathLike],
+        row_group_size: int = 10_000,
+        columns: Optional[list] = None,
+    ) -> int:
+        """Flatten `source` into the Parquet file `path`.
+        Every `row_group_size` records are flattened and written as soon
+        as they are ready, in row groups of at most `row_group_size` rows.
+
+        :param source: Dataframe, path of a newline delimited JSON file,
+            a file object of such lines or an iterable of records.
+        :type source: ``pd.DataFrame``, ``str``, ``os.PathLike``, file object
+            or ``Iterable[dict]``
+        :param path: Path of the Parquet file.
+        :type path: ``str`` or ``os.PathLike``
+        :param row_group_size: Maximum number of records per chunk
+            and of rows per row group, defaults to 10_000.
+        :type row_group_size: ``int``, optional
+        :param columns: Flattened columns of every chunk, see `iter_flatten`,
+            defaults to the columns of the first chunk.
+        :type columns: ``list``, optional
+        :return: Number of rows written.
+        :rtype: ``int``
+        """
+
+        num_rows = 0
+        writer = None
+        try:
+            for batch in self.iter_arrow_batches(
+                source=source, chunksize=row_group_size, columns=columns
+            ):
+                if writer is None:
+                    writer = pq.ParquetWriter(where=path, schema=batch.schema)
+                writer.write_table(
+                    pa.Table.from_batches([batch]), row_group_size=row_group_size
+                )
+                num_rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            pq.write_table(pa.table({}), where=path)
+
+        return num_rows
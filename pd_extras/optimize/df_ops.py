@@ -5,6 +5,24 @@ import numpy as np
 import pandas as pd
 from pd_extras.check.sanitize import check_if_columns_exist
 
+row_layouts = ["array", "records", "columns"]
+
+
+def _take_columns(data: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    """Take the columns at `positions`. Evenly spaced positions are taken
+    as a slice, which pandas returns as a view of a single block frame.
+    """
+
+    if positions.shape[0] > 0:
+        step = int(positions[1] - positions[0]) if positions.shape[0] > 1 else 1
+        if step != 0 and np.all(np.diff(positions) == step):
+            stop = int(positions[-1]) + step
+            return data.iloc[
+                :, slice(int(positions[0]), stop if stop >= 0 else None, step)
+            ]
+
+    return np.take(a=data, indices=positions, axis=1)  # type: ignore
+
 
 def select_columns_from_dataframe(
     data: pd.DataFrame,
@@ -13,11 +31,15 @@ def select_columns_from_dataframe(
     """Get a dataframe consisting columns from a dataframe
     This is the fastest approach from some tests conducted.
     ``df.iloc[indices, column_indices]`` is a close second.
+    Positions of the columns are looked up in a map cached per column index.
+    Evenly spaced columns, e.g. a run of neighbouring columns, of a
+    dataframe whose columns share one dtype block are returned as a view.
 
     :param data: Dataframe to take columns from.
     :type data: ``pd.DataFrame``
     :param columns: List of columns.
     :type columns: ``list``
+    :raises ValueError: With every column not found in the dataframe.
     :return: Dataframe with the selected columns.
     :rtype: ``pd.DataFrame``
 
@@ -25,34 +47,47 @@ def select_columns_from_dataframe(
     >>> res = select_columns_from_dataframe(data=data, columns=list(columns))
     """
 
-    check_if_columns_exist(columns=columns, data=data)
+    positions = check_if_columns_exist(columns=columns, data=data)
 
-    indices: dict = {column: idx for idx, column in enumerate(data.columns)}
+    return _take_columns(data=data, positions=positions)
 
-    selected_indices: list = []
-    for column in columns:
-        selected_indices.append(indices[column])
 
-    return np.take(a=data, indices=selected_indices, axis=1)  # type: ignore
+def get_rows(data: pd.DataFrame, columns: list, layout: str = "array"):
+    """Get iterable rows for the selected columns.
 
+    `layout` chooses how rows are returned:
 
-def get_rows(data: pd.DataFrame, columns: list) -> np.ndarray:
-    """Get iterable rows for the selected columns.
+    * ``"array"``: one 2D array, upcast to a common dtype.
+    * ``"records"``: a structured array, one field per column
+      with its own dtype.
+    * ``"columns"``: a tuple of 1D arrays, one per column with its own
+      dtype and without copying numpy columns. Iterate rows with ``zip(*rows)``.
 
     :param data: Pandas dataframe to select columns from.
     :type data: ``pd.DataFrame``
     :param columns: List of columns.
     :type columns: ``list``
+    :param layout: One of "array", "records" or "columns", defaults to "array".
+    :type layout: ``str``, optional
+    :raises ValueError: If a column is not found or `layout` is unknown.
     :return: Numpy array containing iterable rows.
-    :rtype: ``np.ndarray``
+    :rtype: ``np.ndarray`` or ``tuple``
 
     >>> from pandas_utils.optimize.df_ops import get_rows
     >>> rows = get_rows(data=data, columns=list(columns))
     """
 
-    check_if_columns_exist(columns=columns, data=data)
+    if layout not in row_layouts:
+        raise ValueError(f"layout must be one of {row_layouts}, got {layout}")
+
+    positions = check_if_columns_exist(columns=columns, data=data)
+    if layout == "columns":
+        return tuple(data.iloc[:, idx].to_numpy() for idx in positions)
+
+    data = _take_columns(data=data, positions=positions)
+    if layout == "records":
+        return data.to_records(index=False)
 
-    data = select_columns_from_dataframe(data=data, columns=columns)
     rows = data.to_numpy()
 
     return rows
@@ -0,0 +1,480 @@
+"""Write a pandas dataframe to a NoSQL database collection with asyncio"""
+
+import time
+from typing import Optional
+
+import pandas as pd
+from pd_extras.write.common import async_bounded_map, nosql_dbtypes, run_to_completion
+from pd_extras.write.nosql_writer import (
+    BatchWriteResult,
+    _check_write_mode,
+    _encode_all,
+    _encode_batch,
+    _get_batch_bounds,
+    _get_batch_result,
+    _get_bulk_write_result,
+    _get_frame,
+    _get_index_keys,
+    _get_insert_result,
+    _get_write_operations,
+)
+from pymongo.errors import BulkWriteError
+
+__all__ = ["AsyncNoSQLDatabaseWriter"]
+
+
+class AsyncMongoDatabaseWriter:
+    """Writer class for Mongo databases using motor"""
+
+    def __init__(
+        self,
+        host: str,
+        dbname: str,
+        user: str,
+        password: str,
+        port: int,
+        dns_seed_list: bool = False,
+        pool_options: Optional[dict] = None,
+    ) -> None:
+        self._dns_seed_list = dns_seed_list
+
+        port = int(port)
+        self.__client = self._get_mongo_client(
+            host=host,
+            username=user,
+            password=password,
+            port=port,
+            pool_options=pool_options,
+        )
+        self.__dbname: str = dbname
+        self.__db = self.__client[dbname]
+
+    def _get_mongo_client(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        port: int,
+        pool_options: Optional[dict] = None,
+    ):
+        try:
+            from motor.motor_asyncio import AsyncIOMotorClient
+        except ImportError as exc:
+            raise ImportError(
+                "motor is required for AsyncNoSQLDatabaseWriter, "
+                "install pd-extras[async]"
+            ) from exc
+
+        service = "mongodb"
+
+        if self._dns_seed_list:
+            service = f"{service}+srv"
+        connection_string: str = f"{service}://{username}:{password}@{host}/"
+
+        return AsyncIOMotorClient(
+            host=connection_string,
+            port=port,
+            document_class=dict,
+            **(pool_options or {}),
+        )
+
+    async def _get_list_of_databases(self):
+        return await self.__client.list_database_names()
+
+    async def _get_list_of_collections(self):
+        return await self.__db.list_collection_names()
+
+    def _get_or_create_collection(self, collection_name: str):
+        collection = self.__db[collection_name]
+
+        return collection
+
+    async def _write_data_to_collection(
+        self,
+        data: pd.DataFrame,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        ordered: bool = True,
+        workers: int = 1,
+        nulls: str = "none",
+        raw_bson: bool = False,
+        mode: str = "insert",
+        key: Optional[list] = None,
+        create_index: bool = True,
+    ):
+        _check_write_mode(mode=mode, key=key, raw_bson=raw_bson)
+        collection = self._get_or_create_collection(collection_name=collection_name)
+
+        if mode != "insert":
+            if create_index:
+                await collection.create_index(_get_index_keys(key=key))
+
+            data = data.drop_duplicates(subset=key, keep="last")
+            batch_size = batch_size or 1000
+
+        if batch_size is None:
+            documents = _encode_all(data=data, nulls=nulls, raw_bson=raw_bson)
+
+            return await run_to_completion(
+                collection.insert_many(documents=documents, ordered=ordered)
+            )
+
+        return await self._write_batches_to_collection(
+            data=data,
+            collection=collection,
+            batch_size=batch_size,
+            ordered=ordered,
+            workers=workers,
+            nulls=nulls,
+            raw_bson=raw_bson,
+            mode=mode,
+            key=key,
+        )
+
+    async def _insert_batch(self, collection, documents: list, ordered: bool) -> dict:
+        try:
+            res = await collection.insert_many(documents=documents, ordered=ordered)
+        except BulkWriteError as exc:
+            return _get_insert_result(
+                documents=documents, details=exc.details, ordered=ordered
+            )
+
+        return {"inserted_ids": res.inserted_ids, "errors": []}
+
+    async def _upsert_batch(
+        self, collection, documents: list, ordered: bool, mode: str, key: list
+    ) -> dict:
+        operations = _get_write_operations(documents=documents, mode=mode, key=key)
+
+        try:
+            res = await collection.bulk_write(operations, ordered=ordered)
+            details = res.bulk_api_result
+        except BulkWriteError as exc:
+            details = exc.details
+
+        return _get_bulk_write_result(details=details)
+
+    async def _write_batch(
+        self,
+        data: pd.DataFrame,
+        collection,
+        start: int,
+        stop: int,
+        ordered: bool,
+        nulls: str,
+        raw_bson: bool,
+        mode: str = "insert",
+        key: Optional[list] = None,
+    ):
+        began = time.perf_counter()
+        documents = _encode_batch(
+            data=data, start=start, stop=stop, nulls=nulls, raw_bson=raw_bson
+        )
+
+        if mode == "insert":
+            res = await run_to_completion(
+                self._insert_batch(
+                    collection=collection, documents=documents, ordered=ordered
+                )
+            )
+        else:
+            res = await run_to_completion(
+                self._upsert_batch(
+                    collection=collection,
+                    documents=documents,
+                    ordered=ordered,
+                    mode=mode,
+                    key=key,
+                )
+            )
+
+        return _get_batch_result(start=start, stop=stop, began=began, res=res)
+
+    async def _write_batches_to_collection(
+        self,
+        data: pd.DataFrame,
+        collection,
+        batch_size: int,
+        ordered: bool,
+        workers: int,
+        nulls: str,
+        raw_bson: bool,
+        mode: str = "insert",
+        key: Optional[list] = None,
+    ):
+        bounds = _get_batch_bounds(
+            num_rows=data.shape[0],
+            batch_size=batch_size,
+            workers=workers,
+            ordered=ordered,
+        )
+        if ordered:
+            batches = []
+            for start, stop in bounds:
+                batches.append(
+                    await self._write_batch(
+                        data=data,
+                        collection=collection,
+                        start=start,
+                        stop=stop,
+                        ordered=ordered,
+                        nulls=nulls,
+                        raw_bson=raw_bson,
+                        mode=mode,
+                        key=key,
+                    )
+                )
+                if batches[-1].errors:
+                    break
+
+            return BatchWriteResult(batches=batches)
+
+        batches = await async_bounded_map(
+            func=lambda bound: self._write_batch(
+                data=data,
+                collection=collection,
+                start=bound[0],
+                stop=bound[1],
+                ordered=ordered,
+                nulls=nulls,
+                raw_bson=raw_bson,
+                mode=mode,
+                key=key,
+            ),
+            items=bounds,
+            workers=workers,
+        )
+
+        return BatchWriteResult(batches=sorted(batches, key=lambda batch: batch.start))
+
+    async def _read_collection(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        projection=None,
+        batch_size: int = 1000,
+        flatten: bool = False,
+        sep: str = ".",
+    ):
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, got {batch_size}")
+
+        collection = self._get_or_create_collection(collection_name=collection_name)
+        cursor = collection.find(
+            filter=filter or {}, projection=projection, batch_size=batch_size
+        )
+
+        try:
+            while True:
+                documents = await cursor.to_list(length=batch_size)
+                if not documents:
+                    break
+
+                yield _get_frame(documents=documents, flatten=flatten, sep=sep)
+        finally:
+            await cursor.close()
+
+    async def _get_document_count(self, collection_name: str):
+        collection = self._get_or_create_collection(collection_name=collection_name)
+
+        return await collection.count_documents({})
+
+    async def _delete_collection(self, collection_name: str):
+        await self.__db.drop_collection(collection_name)
+
+    async def _delete_database(self):
+        await self.__client.drop_database(name_or_database=self.__dbname)
+
+    def _close_connection(self):
+        self.__client.close()
+
+
+class AsyncNoSQLDatabaseWriter:
+    """Writer class for NoSQL Database with asyncio.
+    Methods are the same as `NoSQLDatabaseWriter` but are coroutines,
+    and `read_collection` returns an async generator.
+    Needs the ``async`` extra (motor).
+    Batches run as up to `workers` tasks and the next batch is only encoded
+    when one of them is done. A batch that was sent to the server is awaited
+    even if the write is cancelled, so no batch is still being written once
+    the cancellation is raised.
+
+    >>> conn = AsyncNoSQLDatabaseWriter(dbtype="mongo", **credentials)
+    >>> result = await conn.write_data_to_collection(name, data, batch_size=1000)
+    >>> await conn.close_connection()
+    """
+
+    def __init__(
+        self,
+        dbtype: str,
+        host: str,
+        dbname: str,
+        user: str,
+        password: str,
+        port: int,
+        dns_seed_list: bool = False,
+        pool_options: Optional[dict] = None,
+    ) -> None:
+        if dbtype not in nosql_dbtypes:
+            raise ValueError(f"{dbtype} not in {nosql_dbtypes}")
+
+        self.__dbtype = dbtype
+
+        self.__writer = self._get_writer(
+            host=host,
+            dbname=dbname,
+            user=user,
+            password=password,
+            port=port,
+            dns_seed_list=dns_seed_list,
+            pool_options=pool_options,
+        )
+
+    def _get_writer(
+        self,
+        host: str,
+        dbname: str,
+        user: str,
+        password: str,
+        port: int,
+        dns_seed_list: bool = False,
+        pool_options: Optional[dict] = None,
+    ):
+        if self.__dbtype == "mongo":
+            return AsyncMongoDatabaseWriter(
+                host=host,
+                dbname=dbname,
+                user=user,
+                password=password,
+                port=port,
+                dns_seed_list=dns_seed_list,
+                pool_options=pool_options,
+            )
+
+        return None
+
+    async def get_list_of_databases(self):
+        """List names of databses in this connection.
+
+        :return: Database names.
+        :rtype: `list[str]`
+        """
+
+        return await self.__writer._get_list_of_databases()
+
+    async def get_list_of_collections(self):
+        """List names of collections in the current database.
+
+        :return: Collection names.
+        :rtype: `list[str]`
+        """
+
+        return await self.__writer._get_list_of_collections()
+
+    def get_or_create_collection(self, collection_name: str):
+        """Get object for the collection `collection_name`.
+
+        :param collection_name: Name of the collection.
+        :type collection_name: `str`
+        :return: Collection object.
+        :rtype: `motor.motor_asyncio.AsyncIOMotorCollection`
+        """
+
+        return self.__writer._get_or_create_collection(collection_name=collection_name)
+
+    async def write_data_to_collection(
+        self,
+        collection_name: str,
+        data: pd.DataFrame,
+        batch_size: Optional[int] = None,
+        ordered: Optional[bool] = None,
+        workers: int = 1,
+        nulls: str = "none",
+        raw_bson: bool = False,
+        mode: str = "insert",
+        key: Optional[list] = None,
+        create_index: bool = True,
+    ):
+        """Write dataframe `data` to the collection `collection_name`.
+        Arguments are the same as `NoSQLDatabaseWriter.write_data_to_collection`.
+        `workers` is the number of batches in flight on the event loop.
+
+        :return: Object with ids of inserted documents.
+            With `batch_size` or another `mode`, per-batch counts, ids and write
+            errors.
+        :rtype: `pymongo.results.InsertManyResult` or `BatchWriteResult`
+        """
+
+        if ordered is None:
+            ordered = mode == "insert" and workers == 1
+
+        return await self.__writer._write_data_to_collection(
+            collection_name=collection_name,
+            data=data,
+            batch_size=batch_size,
+            ordered=ordered,
+            workers=workers,
+            nulls=nulls,
+            raw_bson=raw_bson,
+            mode=mode,
+            key=key,
+            create_index=create_index,
+        )
+
+    def read_collection(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        projection=None,
+        batch_size: int = 1000,
+        flatten: bool = False,
+        sep: str = ".",
+    ):
+        """Read documents of the collection `collection_name` in chunks.
+        Arguments are the same as `NoSQLDatabaseWriter.read_collection`.
+
+        :return: Async generator of dataframes with at most `batch_size` rows.
+        :rtype: `AsyncIterator[pd.DataFrame]`
+
+        >>> async for chunk in conn.read_collection(collection_name):
+        >>>     process(chunk)
+        """
+
+        return self.__writer._read_collection(
+            collection_name=collection_name,
+            filter=filter,
+            projection=projection,
+            batch_size=batch_size,
+            flatten=flatten,
+            sep=sep,
+        )
+
+    async def get_document_count(self, collection_name: str):
+        """Get number of documents in collection `collection_name`.
+
+        :param collection_name: Name of the collection.
+        :type collection_name: `str`
+        :return: Document count.
+        :rtype: `int`
+        """
+
+        return await self.__writer._get_document_count(collection_name=collection_name)
+
+    async def delete_collection(self, collection_name: str):
+        """Delete collection `collection_name`.
+
+        :param collection_name: Name of the collection.
+        :type collection_name: `str`
+        """
+
+        await self.__writer._delete_collection(collection_name=collection_name)
+
+    async def delete_database(self):
+        """Drop the current database."""
+
+        await self.__writer._delete_database()
+
+    async def close_connection(self):
+        """Close the current connection."""
+
+        self.__writer._close_connection()
@@ -0,0 +1,616 @@
+"""Write a pandas dataframe to a SQL database table with asyncio"""
+
+import asyncio
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+from pd_extras.write.common import (
+    async_bounded_map,
+    run_to_completion,
+    saved_values,
+)
+from pd_extras.write.loaders import (
+    AsyncPostgresCopyLoader,
+    PostgresCopyLoader,
+    to_records,
+)
+from pd_extras.write.sql_writer import (
+    _MISSING,
+    SQLDatabaseWriter,
+    WriteResult,
+    _ChunkedWrite,
+    _concat_tables,
+    _ensure_database_exists,
+    _PartitionWrite,
+)
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+__all__ = ["AsyncSQLDatabaseWriter", "async_dbtypes"]
+
+async_dbtypes = [
+    dbtype for dbtype, values in saved_values.items() if "async_driver" in values
+]
+
+
+class AsyncSQLDatabaseWriter(SQLDatabaseWriter):
+    """Database connection object for SQL databases with an asyncio engine.
+    Methods are the same as `SQLDatabaseWriter` but are coroutines, and
+    methods returning generators return async generators.
+    Needs the ``async`` extra: asyncpg for postgresql and aiomysql for mysql.
+    The database is checked and created on the first write unless
+    `assume_exists=True`.
+    A commit that has been sent is awaited even if the task writing it is
+    cancelled, and rows that were not committed yet are rolled back, so a
+    cancelled write never leaves part of a transaction behind.
+    Be sure to call ``await connobj.close_connection()`` after you are done.
+
+    >>> conn = AsyncSQLDatabaseWriter(dbtype="postgresql", **credentials)
+    >>> result = await conn.parallel_write_df_to_db(data, table_name, workers=8)
+    >>> await conn.close_connection()
+    """
+
+    def __init__(
+        self,
+        dbtype: str,
+        host: str,
+        dbname: str,
+        user: str,
+        password: str,
+        port: int,
+        schema_cache_ttl: float = 60.0,
+        pool_options: Optional[dict] = None,
+        assume_exists: bool = False,
+        local_infile: bool = False,
+    ):
+        if dbtype not in async_dbtypes:
+            raise ValueError(f"{dbtype} not in {async_dbtypes}")
+
+        self.__dbtype = dbtype
+        self.__dbname = dbname
+        self.__assume_exists = assume_exists
+
+        super().__init__(
+            dbtype=dbtype,
+            host=host,
+            dbname=dbname,
+            user=user,
+            password=password,
+            port=port,
+            schema_cache_ttl=schema_cache_ttl,
+            pool_options=pool_options,
+            lazy=True,
+            assume_exists=assume_exists,
+            local_infile=local_infile,
+        )
+
+    def _get_db_specific_engine(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        port: int,
+        pool_options: Optional[dict] = None,
+    ):
+        dialect = saved_values[self.__dbtype]["dialect"]
+        driver = saved_values[self.__dbtype]["async_driver"]
+
+        connection_string = (
+            f"{dialect}{driver}://{user}:{password}@{host}:{port}/{self.__dbname}"
+        )
+
+        self.__engine = create_async_engine(
+            connection_string,
+            connect_args=self._get_connect_args(),
+            **(pool_options or {}),
+        )
+
+        return self.__engine
+
+    async def _ensure_database(self) -> None:
+        if self.__assume_exists:
+            return
+
+        dialect = saved_values[self.__dbtype]["dialect"]
+        driver = saved_values[self.__dbtype]["driver"]
+        url = self.__engine.url.set(drivername=f"{dialect}{driver}")
+
+        await asyncio.to_thread(_ensure_database_exists, url)
+
+    async def get_data_from_query(self, query: str):
+        """Execute a single query on the current database.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :return: Pandas dataframe with result of query.
+        :rtype: `pd.DataFrame`
+        """
+
+        async with self.__engine.connect() as conn:
+            result = await conn.execute(text(query))
+
+            return pd.DataFrame(
+                [tuple(row) for row in result.fetchall()], columns=list(result.keys())
+            )
+
+    async def iter_query(
+        self,
+        query: str,
+        chunksize: int = 10_000,
+        dtypes: Optional[dict] = None,
+    ):
+        """Execute a single query and get the result in chunks
+        from a server-side cursor.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :param chunksize: Number of rows per chunk, defaults to 10_000.
+        :type chunksize: `int`, optional
+        :param dtypes: Mapping of column names to dtypes to cast each chunk to,
+            defaults to None.
+        :type dtypes: `dict`, optional
+        :return: Async generator of pandas dataframes with at most `chunksize` rows.
+        :rtype: `AsyncIterator[pd.DataFrame]`
+
+        >>> async for chunk in conn.iter_query(query=query, chunksize=1000):
+        >>>     process(chunk)
+        """
+
+        if chunksize < 1:
+            raise ValueError(f"`chunksize` must be positive, got {chunksize}")
+
+        async with self.__engine.connect() as conn:
+            result = await conn.stream(text(query))
+            columns = list(result.keys())
+
+            async for rows in result.partitions(chunksize):
+                chunk = pd.DataFrame([tuple(row) for row in rows], columns=columns)
+                if dtypes:
+                    chunk = chunk.astype(
+                        {
+                            column: dtype
+                            for column, dtype in dtypes.items()
+                            if column in chunk.columns
+                        }
+                    )
+
+                yield chunk
+
+    async def _fetch_arrow_batches(
+        self, result, batch_size: int, schema: Optional[pa.Schema] = None
+    ):
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, got {batch_size}")
+
+        names = list(result.keys())
+        async for rows in result.partitions(batch_size):
+            batch = self._get_arrow_batch(rows=rows, names=names, schema=schema)
+            schema = batch.schema
+
+            yield batch
+
+    async def iter_arrow_batches(
+        self,
+        query: str,
+        batch_size: int = 10_000,
+        schema: Optional[pa.Schema] = None,
+    ):
+        """Execute a single query and get the result as Arrow record batches.
+        See `SQLDatabaseWriter.iter_arrow_batches`.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :param batch_size: Number of rows per batch, defaults to 10_000.
+        :type batch_size: `int`, optional
+        :param schema: Arrow schema of the result, defaults to None.
+        :type schema: `pa.Schema`, optional
+        :return: Async generator of record batches with at most `batch_size` rows.
+        :rtype: `AsyncIterator[pa.RecordBatch]`
+        """
+
+        async with self.__engine.connect() as conn:
+            result = await conn.stream(text(query))
+
+            async for batch in self._fetch_arrow_batches(
+                result=result, batch_size=batch_size, schema=schema
+            ):
+                yield batch
+
+    async def get_arrow_from_query(
+        self,
+        query: str,
+        batch_size: int = 10_000,
+        schema: Optional[pa.Schema] = None,
+    ) -> pa.Table:
+        """Execute a single query on the current database.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :param batch_size: Number of rows fetched at a time, defaults to 10_000.
+        :type batch_size: `int`, optional
+        :param schema: Arrow schema of the result, defaults to None.
+        :type schema: `pa.Schema`, optional
+        :return: Arrow table with result of query.
+        :rtype: `pa.Table`
+        """
+
+        async with self.__engine.connect() as conn:
+            result = await conn.stream(text(query))
+
+            tables = [
+                pa.Table.from_batches([batch])
+                async for batch in self._fetch_arrow_batches(
+                    result=result, batch_size=batch_size, schema=schema
+                )
+            ]
+            if not tables:
+                if schema is None:
+                    schema = pa.schema([(name, pa.null()) for name in result.keys()])
+
+                return schema.empty_table()
+
+        return _concat_tables(tables=tables)
+
+    async def get_list_of_database(self):
+        """Get list of databases.
+
+        :return: List containing database names.
+        :rtype: `list[str]`
+        """
+
+        query = saved_values[self.__dbtype]["query"]["db_list"]
+
+        res = await self.get_data_from_query(query=query)
+
+        return res[res.columns[0]].to_numpy()
+
+    async def get_column_info(self, table_name: str):
+        """Get table schema from database.
+
+        :param table_name: Name of the table in database.
+        :type table_name: ``str``
+        :return: Pandas dataframe of table schema information.
+        :rtype: ``pd.DataFrame``
+        """
+
+        self._check_name(name=self.__dbname)
+        self._check_name(name=table_name)
+
+        cached = self.schema_cache.get(
+            dbname=self.__dbname, table_name=table_name, kind="column_info"
+        )
+        if cached is not _MISSING:
+            return cached.copy()
+
+        query: str = saved_values[self.__dbtype]["query"]["column_info"] % (
+            self.__dbname,
+            table_name,
+        )
+        async with self.__engine.connect() as conn:
+            result = await conn.execute(text(query))
+            info = pd.DataFrame(
+                [list(row) for row in result.fetchall()],
+                columns=[str(column).lower() for column in result.keys()],
+            )
+
+        self.schema_cache.set(
+            dbname=self.__dbname, table_name=table_name, kind="column_info", value=info
+        )
+
+        return info.copy()
+
+    async def has_table(self, table_name: str):
+        """Check if the current database has table `table_name`.
+
+        :param table_name: Name of the table to check.
+        :type table_name: `str`
+        :return: True if `table_name` exists in current database.
+        :rtype: `bool`
+        """
+
+        cached = self.schema_cache.get(
+            dbname=self.__dbname, table_name=table_name, kind="has_table"
+        )
+        if cached is not _MISSING:
+            return cached
+
+        async with self.__engine.connect() as conn:
+            exists = await conn.run_sync(
+                lambda sync_conn: sync_conn.dialect.has_table(sync_conn, table_name)
+            )
+
+        self.schema_cache.set(
+            dbname=self.__dbname, table_name=table_name, kind="has_table", value=exists
+        )
+
+        return exists
+
+    async def _create_new_table(self, table: Table):
+        if not await self.has_table(table_name=table.name):
+            async with self.__engine.begin() as conn:
+                await conn.run_sync(
+                    lambda sync_conn: table.create(bind=sync_conn, checkfirst=True)
+                )
+            self.invalidate_schema_cache(table_name=table.name)
+
+        return table
+
+    async def _load_chunk(
+        self, conn: AsyncConnection, table: Table, data: pd.DataFrame, method: str
+    ) -> int:
+        loader = self._get_loader(method=method)
+        if isinstance(loader, PostgresCopyLoader):
+            return await AsyncPostgresCopyLoader().load(
+                conn=conn, table=table, data=data
+            )
+
+        return await conn.run_sync(loader.load, table, data)
+
+    async def _write_data_to_table(self, data: pd.DataFrame, table: Table):
+        async with self.__engine.connect() as conn:
+            result = await conn.execute(table.insert(), to_records(data=data))
+            await run_to_completion(conn.commit())
+
+            return result
+
+    async def _write_data_in_chunks(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        chunksize: int,
+        commit_every: int = 1,
+        method: str = "executemany",
+    ):
+        chunked = _ChunkedWrite(
+            num_rows=data.shape[0], chunksize=chunksize, commit_every=commit_every
+        )
+
+        async with self.__engine.connect() as conn:
+            for start, stop in chunked:
+                try:
+                    rowcount = await self._load_chunk(
+                        conn=conn,
+                        table=table,
+                        data=data.iloc[start:stop],
+                        method=method,
+                    )
+                    if chunked.loaded(rowcount=rowcount):
+                        await run_to_completion(conn.commit())
+                        chunked.commit()
+                except Exception as exc:
+                    await conn.rollback()
+                    raise chunked.fail(error=exc) from exc
+
+        return chunked.result
+
+    async def _write_partition(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        start: int,
+        stop: int,
+        method: str,
+        retries: int,
+    ):
+        partition = _PartitionWrite(start=start, stop=stop, retries=retries)
+
+        for _ in partition:
+            try:
+                async with self.__engine.connect() as conn:
+                    rowcount = await self._load_chunk(
+                        conn=conn,
+                        table=table,
+                        data=data.iloc[start:stop],
+                        method=method,
+                    )
+                    await run_to_completion(conn.commit())
+            except Exception as exc:
+                partition.failed(error=exc)
+            else:
+                partition.succeeded(rowcount=rowcount)
+
+        return partition.result
+
+    async def _upsert_data_to_table(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        key_columns: list,
+        chunksize: Optional[int] = None,
+        method: str = "executemany",
+    ):
+        data, staging, bounds, upsert_query, drop_query = self._prepare_upsert(
+            data=data, table=table, key_columns=key_columns, chunksize=chunksize
+        )
+
+        async with self.__engine.connect() as conn:
+            await conn.run_sync(lambda sync_conn: staging.create(bind=sync_conn))
+            try:
+                for start, stop in bounds:
+                    await self._load_chunk(
+                        conn=conn,
+                        table=staging,
+                        data=data.iloc[start:stop],
+                        method=method,
+                    )
+                result = await conn.execute(text(upsert_query))
+                await run_to_completion(conn.commit())
+            except BaseException:
+                await conn.rollback()
+                raise
+            finally:
+                await conn.exec_driver_sql(drop_query)
+                await run_to_completion(conn.commit())
+
+        return result
+
+    async def delete_table(self, table_name: str):
+        """Drop table `table_name` from the current database if it exists.
+
+        :param table_name: Table to delete.
+        :type table_name: `str`
+        """
+
+        query = f"DROP TABLE IF EXISTS {table_name}"
+        async with self.__engine.connect() as conn:
+            await conn.execute(text(query))
+            await run_to_completion(conn.commit())
+
+        self.invalidate_schema_cache(table_name=table_name)
+
+    async def _prepare_write(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        id_col: str,
+        drop_first: bool,
+        clean_columns: bool,
+        max_length: int,
+        unique_columns: Optional[list] = None,
+    ):
+        await self._ensure_database()
+
+        data, table, null_counts = self._get_write_table(
+            data=data,
+            table_name=table_name,
+            id_col=id_col,
+            clean_columns=clean_columns,
+            max_length=max_length,
+            unique_columns=unique_columns,
+        )
+
+        if drop_first:
+            await self.delete_table(table_name=table_name)
+
+        table = await self._create_new_table(table=table)
+        info = await self.get_column_info(table_name=table_name)
+        data = self._check_null(
+            data=data, info=info, id_col=id_col, null_counts=null_counts
+        )
+
+        return data, table
+
+    async def write_df_to_db(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        id_col: str = "id",
+        drop_first: bool = False,
+        clean_columns: bool = True,
+        max_length: int = 100,
+        chunksize: Optional[int] = None,
+        commit_every: int = 1,
+        method: str = "executemany",
+        if_exists: str = "append",
+        key_columns: Optional[list] = None,
+    ):
+        """Write `data` to Table `table_name`.
+        Arguments are the same as `SQLDatabaseWriter.write_df_to_db`.
+        With "native" `method`, postgresql uses ``copy_records_to_table`` of asyncpg.
+
+        :return: Cursor with result of query execution.
+            With `chunksize` or another `method`, per-chunk row counts and timings.
+        :rtype: `sqlalchemy.engine.cursor.CursorResult` or `WriteResult`
+        """
+
+        drop_first = self._check_write(
+            data=data,
+            id_col=id_col,
+            clean_columns=clean_columns,
+            if_exists=if_exists,
+            key_columns=key_columns,
+            drop_first=drop_first,
+            method=method,
+        )
+
+        data, table = await self._prepare_write(
+            data=data,
+            table_name=table_name,
+            id_col=id_col,
+            drop_first=drop_first,
+            clean_columns=clean_columns,
+            max_length=max_length,
+            unique_columns=key_columns if if_exists == "upsert" else None,
+        )
+
+        if if_exists == "upsert":
+            return await self._upsert_data_to_table(
+                data=data,
+                table=table,
+                key_columns=key_columns,
+                chunksize=chunksize,
+                method=method,
+            )
+
+        if chunksize or method != "executemany":
+            return await self._write_data_in_chunks(
+                data=data,
+                table=table,
+                chunksize=chunksize or max(data.shape[0], 1),
+                commit_every=commit_every,
+                method=method,
+            )
+
+        return await self._write_data_to_table(data=data, table=table)
+
+    async def parallel_write_df_to_db(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        workers: int = 4,
+        chunksize: Optional[int] = None,
+        id_col: str = "id",
+        drop_first: bool = False,
+        clean_columns: bool = True,
+        max_length: int = 100,
+        method: str = "executemany",
+        retries: int = 2,
+    ):
+        """Write `data` to Table `table_name` over several connections at once.
+        Arguments are the same as `SQLDatabaseWriter.parallel_write_df_to_db`,
+        but partitions are written by `workers` tasks on the running event loop.
+        A partition is only converted to rows when a task is free to send it,
+        so at most `workers` partitions are in memory at a time.
+        If the write is cancelled, partitions in flight are cancelled too.
+
+        :return: Per-partition row counts, timings, attempts and errors.
+        :rtype: `WriteResult`
+        """
+
+        partitions = self._get_partitions(
+            num_rows=data.shape[0],
+            workers=workers,
+            chunksize=chunksize,
+            retries=retries,
+        )
+        self._get_loader(method=method)
+
+        data, table = await self._prepare_write(
+            data=data,
+            table_name=table_name,
+            id_col=id_col,
+            drop_first=drop_first,
+            clean_columns=clean_columns,
+            max_length=max_length,
+        )
+
+        chunks = await async_bounded_map(
+            func=lambda partition: self._write_partition(
+                data=data,
+                table=table,
+                start=partition[0],
+                stop=partition[1],
+                method=method,
+                retries=retries,
+            ),
+            items=partitions,
+            workers=workers,
+        )
+
+        return WriteResult(chunks=sorted(chunks, key=lambda chunk: chunk.start))
+
+    async def close_connection(self):
+        """Close the current connection to the database."""
+
+        await self.__engine.dispose()
@@ -1,9 +1,14 @@
-"""Common variables for dataframe to database module"""
+"""Common variables and helpers for dataframe to database module"""
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable
 
 saved_values = {
     "sqlserver": {
         "dialect": "mssql",
         "driver": "+pymssql",
+        "loader": "bulk_copy",
         "query": {
             "db_list": "SELECT name FROM master.sys.databases;",
             "table_list": """SELECT TABLE_NAME FROM
@@ -12,28 +17,160 @@ saved_values = {
             "column_info": """SELECT * FROM
                 information_schema.columns WHERE TABLE_CATALOG='%s' AND
                 TABLE_SCHEMA = 'dbo' AND TABLE_NAME = '%s';""",
+            "upsert": """MERGE INTO {table} AS t USING {staging} AS s
+                ON ({conditions})
+                WHEN MATCHED THEN UPDATE SET {updates}
+                WHEN NOT MATCHED THEN INSERT ({columns}) VALUES ({source_columns});""",
+            "upsert_update": "t.{column} = s.{column}",
+            "drop_staging": "DROP TABLE IF EXISTS {staging};",
         },
+        "staging": {"name": "#{table}__staging", "prefixes": []},
     },
     "mysql": {
         "dialect": "mysql",
         "driver": "+mysqldb",
+        "async_driver": "+aiomysql",
+        "loader": "load_data",
+        "local_infile_args": {"local_infile": 1},
         "query": {
             "db_list": "SHOW DATABASES;",
             "table_list": """SHOW TABLES FROM %s""",
             "column_info": """SELECT *
                 from information_schema.columns
                 WHERE table_schema='%s' and table_name='%s';""",
+            "upsert": """INSERT INTO {table} ({columns})
+                SELECT * FROM (SELECT {columns} FROM {staging}) AS s
+                ON DUPLICATE KEY UPDATE {updates};""",
+            "upsert_update": "{column} = s.{column}",
+            "drop_staging": "DROP TEMPORARY TABLE IF EXISTS {staging};",
         },
+        "staging": {"name": "{table}__staging", "prefixes": ["TEMPORARY"]},
     },
     "postgresql": {
         "dialect": "postgresql",
         "driver": "+psycopg2",
+        "async_driver": "+asyncpg",
+        "loader": "copy",
         "query": {
             "db_list": "select datname from pg_database;",
             "table_list": "select * from pg_catalog.pg_tables where schemaname=%s;",
             "column_info": """select * from information_schema.columns WHERE
                 table_catalog='%s' and table_name='%s';""",
+            "upsert": """INSERT INTO {table} ({columns})
+                SELECT {columns} FROM {staging}
+                ON CONFLICT ({keys}) DO UPDATE SET {updates};""",
+            "upsert_update": "{column} = EXCLUDED.{column}",
+            "drop_staging": "DROP TABLE IF EXISTS {staging};",
         },
+        "staging": {"name": "{table}__staging", "prefixes": ["TEMPORARY"]},
     },
 }
 nosql_dbtypes = ["mongo"]
+
+
+def get_bounds(num_rows: int, size: int) -> list:
+    """Split `num_rows` rows into consecutive slices of at most `size` rows.
+
+    :param num_rows: Number of rows to split.
+    :type num_rows: `int`
+    :param size: Maximum number of rows per slice.
+    :type size: `int`
+    :return: Positional ``(start, stop)`` bounds of each slice.
+    :rtype: `list[tuple[int, int]]`
+    """
+
+    return [(start, min(start + size, num_rows)) for start in range(0, num_rows, size)]
+
+
+def bounded_map(
+    func: Callable, items: Iterable, workers: int, max_pending: int
+) -> list:
+    """Apply `func` to every item of `items` in a thread pool.
+    At most `max_pending` items are submitted at any time, so a long
+    iterable of work is not queued up front.
+
+    :param func: Function taking a single item.
+    :type func: `Callable`
+    :param items: Items to process.
+    :type items: `Iterable`
+    :param workers: Number of threads.
+    :type workers: `int`
+    :param max_pending: Maximum number of submitted but unfinished items.
+    :type max_pending: `int`
+    :return: Results of `func` in order of completion.
+    :rtype: `list`
+    """
+
+    results = []
+    pending: set = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            if len(pending) >= max(max_pending, 1):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+            pending.add(executor.submit(func, item))
+
+        done, _ = wait(pending)
+        results.extend(future.result() for future in done)
+
+    return results
+
+
+async def async_bounded_map(func: Callable, items: Iterable, workers: int) -> list:
+    """Await `func` on every item of `items` concurrently.
+    At most `workers` coroutines run at any time and the next item is only
+    taken from `items` when one of them finishes, so a producer is slowed
+    down to the pace of the consumers. If one call fails or the caller is
+    cancelled, the calls still running are cancelled and awaited first.
+
+    :param func: Coroutine function taking a single item.
+    :type func: `Callable`
+    :param items: Items to process.
+    :type items: `Iterable`
+    :param workers: Maximum number of concurrent calls.
+    :type workers: `int`
+    :return: Results of `func` in order of completion.
+    :rtype: `list`
+    """
+
+    results = []
+    pending: set = set()
+
+    try:
+        for item in items:
+            if len(pending) >= max(workers, 1):
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                results.extend(task.result() for task in done)
+            pending.add(asyncio.ensure_future(func(item)))
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            results.extend(task.result() for task in done)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return results
+
+
+async def run_to_completion(awaitable):
+    """Await `awaitable` even if the calling task is cancelled meanwhile.
+    The cancellation is raised once `awaitable` is done, so an operation that
+    was already sent to the server, like a commit, is never abandoned halfway.
+
+    :param awaitable: Coroutine or future to await.
+    :return: Result of `awaitable`.
+    """
+
+    future = asyncio.ensure_future(awaitable)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await future
+        raise
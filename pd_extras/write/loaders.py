@@ -0,0 +1,344 @@
+"""Load a pandas dataframe into an existing SQL table"""
+
+import csv
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (  # type: ignore
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_extension_array_dtype,
+    is_numeric_dtype,
+)
+from pd_extras.write.common import saved_values
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+
+__all__ = [
+    "ExecuteManyLoader",
+    "PostgresCopyLoader",
+    "MySQLLoadDataLoader",
+    "SQLServerBulkLoader",
+    "AsyncPostgresCopyLoader",
+    "get_loader",
+    "to_records",
+    "to_rows",
+]
+
+
+def _get_column_values(data: pd.DataFrame) -> list:
+    values = []
+    for _, series in data.items():
+        extension = is_extension_array_dtype(series.dtype)
+        nulls = series.isna()
+        if nulls.any():
+            series = series.astype(object).where(~nulls, None)
+        elif extension:
+            series = series.astype(object)
+
+        column_values = series.tolist()
+        if extension:
+            column_values = [
+                value.item() if isinstance(value, np.generic) else value
+                for value in column_values
+            ]
+        values.append(column_values)
+
+    return values
+
+
+def to_records(data: pd.DataFrame) -> list:
+    """Convert a dataframe to records ready to be sent to a database driver.
+    Columns are converted one at a time and only columns with null values or
+    extension dtypes are cast to object, so null values become ``None`` and
+    values are Python scalars without boxing the frame.
+
+    :param data: Dataframe to convert.
+    :type data: `pd.DataFrame`
+    :return: List of dictionaries, one per row.
+    :rtype: `list[dict]`
+    """
+
+    columns = [str(column) for column in data.columns]
+
+    return [dict(zip(columns, row)) for row in zip(*_get_column_values(data=data))]
+
+
+def to_rows(data: pd.DataFrame):
+    """Convert a dataframe to row tuples with null values as ``None``.
+
+    :param data: Dataframe to convert.
+    :type data: `pd.DataFrame`
+    :return: Iterator of tuples, one per row.
+    :rtype: `Iterator[tuple]`
+    """
+
+    return zip(*_get_column_values(data=data))
+
+
+_text_escapes = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _escape_text_values(data: pd.DataFrame) -> pd.DataFrame:
+    positions = [
+        idx
+        for idx, dtype in enumerate(data.dtypes)
+        if not (
+            is_numeric_dtype(dtype)
+            or is_bool_dtype(dtype)
+            or is_datetime64_any_dtype(dtype)
+        )
+    ]
+    if not positions:
+        return data
+
+    data = data.copy(deep=False)
+    for idx in positions:
+        series = data.iloc[:, idx]
+        values = series.to_numpy(dtype=object, copy=True)
+        mask = series.notna().to_numpy()
+        values[mask] = [str(value).translate(_text_escapes) for value in values[mask]]
+        data.isetitem(idx, values)
+
+    return data
+
+
+def _write_text_format(data: pd.DataFrame, file) -> None:
+    """Write `data` as tab separated text, the default format of both
+    PostgreSQL ``COPY`` and MySQL ``LOAD DATA``. Null values are written as
+    ``\\N`` and backslashes, tabs and line breaks in values are escaped,
+    so empty strings and strings like "NULL" or "\\N" are kept as they are.
+    """
+
+    _escape_text_values(data=data).to_csv(
+        file,
+        index=False,
+        header=False,
+        sep="\t",
+        na_rep="\\N",
+        quoting=csv.QUOTE_NONE,
+        lineterminator="\n",
+    )
+
+
+def _format_columns(conn: Connection, data: pd.DataFrame) -> str:
+    preparer = conn.dialect.identifier_preparer
+
+    return ", ".join(preparer.quote(str(column)) for column in data.columns)
+
+
+class ExecuteManyLoader:
+    """Generic loader sending rows through ``table.insert()`` executemany.
+    Works on every dialect and is used as the fallback.
+    """
+
+    def load(self, conn: Connection, table: Table, data: pd.DataFrame) -> int:
+        """Insert `data` into `table` over `conn`.
+
+        :param conn: Open connection. Committing is left to the caller.
+        :type conn: `sqlalchemy.engine.Connection`
+        :param table: Table to load into.
+        :type table: `Table`
+        :param data: Dataframe with the columns of `table` to load.
+        :type data: `pd.DataFrame`
+        :return: Number of rows loaded.
+        :rtype: `int`
+        """
+
+        result = conn.execute(table.insert(), to_records(data=data))
+
+        return result.rowcount
+
+
+class PostgresCopyLoader:
+    """Loader using PostgreSQL ``COPY ... FROM STDIN`` through psycopg2.
+    The dataframe is serialized to an in-memory buffer in the text format
+    of ``COPY`` first.
+    """
+
+    def load(self, conn: Connection, table: Table, data: pd.DataFrame) -> int:
+        """Copy `data` into `table` over `conn`.
+
+        :param conn: Open connection. Committing is left to the caller.
+        :type conn: `sqlalchemy.engine.Connection`
+        :param table: Table to load into.
+        :type table: `Table`
+        :param data: Dataframe with the columns of `table` to load.
+        :type data: `pd.DataFrame`
+        :return: Number of rows loaded.
+        :rtype: `int`
+        """
+
+        buffer = io.StringIO()
+        _write_text_format(data=data, file=buffer)
+        buffer.seek(0)
+
+        table_name = conn.dialect.identifier_preparer.format_table(table)
+        columns = _format_columns(conn=conn, data=data)
+        query = f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT text)"
+
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(query, buffer)
+            rowcount = cursor.rowcount
+        finally:
+            cursor.close()
+
+        return rowcount
+
+
+class MySQLLoadDataLoader:
+    """Loader using MySQL ``LOAD DATA LOCAL INFILE``.
+    MySQL drivers only read local infiles from disk, so the dataframe is
+    written to a temporary file in the default tab separated format of
+    ``LOAD DATA``, which is removed after loading. Booleans are written as 1/0.
+    The server must allow ``local_infile`` and the writer must be created
+    with ``local_infile=True``.
+    """
+
+    def load(self, conn: Connection, table: Table, data: pd.DataFrame) -> int:
+        """Load `data` into `table` over `conn`.
+
+        :param conn: Open connection. Committing is left to the caller.
+        :type conn: `sqlalchemy.engine.Connection`
+        :param table: Table to load into.
+        :type table: `Table`
+        :param data: Dataframe with the columns of `table` to load.
+        :type data: `pd.DataFrame`
+        :return: Number of rows loaded.
+        :rtype: `int`
+        """
+
+        bool_columns = [
+            column for column, dtype in data.dtypes.items() if is_bool_dtype(dtype)
+        ]
+        if bool_columns:
+            data = data.astype({column: "Int8" for column in bool_columns})
+
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".tsv", delete=False, newline="", encoding="utf-8"
+        ) as file:
+            _write_text_format(data=data, file=file)
+
+        try:
+            path = file.name.replace("\\", "/")
+            table_name = conn.dialect.identifier_preparer.format_table(table)
+            columns = _format_columns(conn=conn, data=data)
+            query = (
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table_name} "
+                f"CHARACTER SET utf8mb4 ({columns})"
+            )
+            result = conn.exec_driver_sql(query)
+        finally:
+            os.remove(file.name)
+
+        return result.rowcount
+
+
+class SQLServerBulkLoader:
+    """Loader using the bulk copy API of pymssql (``Connection.bulk_copy``).
+    Rows are streamed as plain tuples without building records.
+    """
+
+    def __init__(self, batch_size: int = 1000) -> None:
+        self.batch_size = batch_size
+
+    def load(self, conn: Connection, table: Table, data: pd.DataFrame) -> int:
+        """Bulk copy `data` into `table` over `conn`.
+
+        :param conn: Open connection.
+        :type conn: `sqlalchemy.engine.Connection`
+        :param table: Table to load into.
+        :type table: `Table`
+        :param data: Dataframe with the columns of `table` to load.
+        :type data: `pd.DataFrame`
+        :return: Number of rows loaded.
+        :rtype: `int`
+        """
+
+        table_columns = table.columns.keys()
+        column_ids = [table_columns.index(column) + 1 for column in data.columns]
+
+        dbapi_connection = conn.connection.dbapi_connection
+        dbapi_connection.bulk_copy(
+            table.name,
+            to_rows(data=data),
+            column_ids=column_ids,
+            batch_size=self.batch_size,
+        )
+
+        return data.shape[0]
+
+
+class AsyncPostgresCopyLoader:
+    """Loader using ``copy_records_to_table`` of asyncpg for async connections.
+    Rows are sent in the binary COPY format without a CSV round trip.
+    The asyncpg adapter of SQLAlchemy only begins its transaction when a
+    statement runs, so one is begun first. The copy then belongs to the
+    transaction of `conn` and is committed or rolled back with it.
+    """
+
+    async def load(self, conn, table: Table, data: pd.DataFrame) -> int:
+        """Copy `data` into `table` over `conn`.
+
+        :param conn: Open connection using the asyncpg driver.
+        :type conn: `sqlalchemy.ext.asyncio.AsyncConnection`
+        :param table: Table to load into.
+        :type table: `Table`
+        :param data: Dataframe with the columns of `table` to load.
+        :type data: `pd.DataFrame`
+        :return: Number of rows loaded.
+        :rtype: `int`
+        """
+
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not driver_connection.is_in_transaction():
+            await conn.exec_driver_sql("SELECT 1")
+
+        status = await driver_connection.copy_records_to_table(
+            table.name,
+            records=list(to_rows(data=data)),
+            columns=[str(column) for column in data.columns],
+            schema_name=table.schema,
+        )
+
+        return int(status.split()[-1])
+
+
+loaders = {
+    "executemany": ExecuteManyLoader,
+    "copy": PostgresCopyLoader,
+    "load_data": MySQLLoadDataLoader,
+    "bulk_copy": SQLServerBulkLoader,
+}
+
+
+def get_loader(dbtype: str, method: str = "executemany"):
+    """Get the loader to write dataframes with.
+
+    :param dbtype: Type of database, one of the keys of ``saved_values``.
+    :type dbtype: `str`
+    :param method: "executemany" for the generic loader, "native" for the
+        bulk loader of `dbtype` or a key of ``loaders``, defaults to "executemany".
+    :type method: `str`, optional
+    :raises ValueError: If `dbtype` or `method` is unknown.
+    :return: Loader object with a ``load(conn, table, data)`` method.
+    :rtype: `ExecuteManyLoader`
+
+    >>> from pd_extras.write.loaders import get_loader
+    >>> loader = get_loader(dbtype="postgresql", method="native")
+    """
+
+    if dbtype not in saved_values:
+        raise ValueError(f"{dbtype} not in {list(saved_values.keys())}")
+
+    if method == "native":
+        method = saved_values[dbtype]["loader"]
+    if method not in loaders:
+        raise ValueError(f"{method} not in {['native'] + list(loaders.keys())}")
+
+    return loaders[method]()
@@ -1,11 +1,301 @@
 """Write a pandas dataframe to a NoSQL database collection"""
 
 
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import bson
+import numpy as np
 import pandas as pd
 import pymongo
-from pd_extras.write.common import nosql_dbtypes
+from bson.raw_bson import RawBSONDocument
+from pandas.api.types import (  # type: ignore
+    is_categorical_dtype,
+    is_datetime64_any_dtype,
+    is_extension_array_dtype,
+)
+from pd_extras.write.common import bounded_map, get_bounds, nosql_dbtypes
+from pd_extras.write.registry import registry
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+__all__ = [
+    "NoSQLDatabaseWriter",
+    "BatchResult",
+    "BatchWriteResult",
+    "encode_frame",
+    "encode_documents",
+]
+
+_DROP = object()
+
+write_modes = ["insert", "upsert", "replace"]
+
+
+def _encode_column(series: pd.Series, null_value) -> list:
+    if is_categorical_dtype(series.dtype):
+        series = pd.Series(series.to_numpy(), index=series.index)
+
+    nulls = series.isna()
+    if is_datetime64_any_dtype(series.dtype):
+        values = list(series.dt.to_pydatetime())
+    else:
+        values = series.tolist()
+        if is_extension_array_dtype(series.dtype):
+            values = [
+                value.item() if isinstance(value, np.generic) else value
+                for value in values
+            ]
+
+    if nulls.any():
+        for idx in nulls.to_numpy().nonzero()[0]:
+            values[idx] = null_value
+
+    return values
+
+
+def encode_frame(data: pd.DataFrame, nulls: str = "none") -> list:
+    """Convert a dataframe to documents, one column at a time.
+    Values are converted to types BSON can store: numpy scalars to Python
+    scalars, datetime64 to ``datetime.datetime`` and categoricals to the
+    values of their categories.
+
+    :param data: Dataframe to convert.
+    :type data: `pd.DataFrame`
+    :param nulls: "none" to store null values (NaN, NaT, None) as ``None``,
+        "drop" to leave the key out of the document, defaults to "none".
+    :type nulls: `str`, optional
+    :raises ValueError: If `nulls` is unknown.
+    :return: List of documents.
+    :rtype: `list[dict]`
+
+    >>> from pd_extras.write.nosql_writer import encode_frame
+    >>> documents = encode_frame(data=data, nulls="drop")
+    """
+
+    if nulls not in ["none", "drop"]:
+        raise ValueError(f"{nulls} not in ['none', 'drop']")
+
+    null_value = None if nulls == "none" else _DROP
+    columns = [str(column) for column in data.columns]
+    values = [_encode_column(series, null_value) for _, series in data.items()]
+
+    if nulls == "none":
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    return [
+        {column: value for column, value in zip(columns, row) if value is not _DROP}
+        for row in zip(*values)
+    ]
+
+
+def _get_write_operations(documents: list, mode: str, key: list) -> list:
+    operations = []
+    for document in documents:
+        query = {column: document.get(column) for column in key}
+        if mode == "replace":
+            operations.append(ReplaceOne(query, document, upsert=True))
+            continue
+
+        if "_id" not in key:
+            _id = document.pop("_id", None)
+        update = {"$set": document} if document else {"$setOnInsert": query}
+        if "_id" not in key and _id is not None:
+            update.setdefault("$setOnInsert", {})["_id"] = _id
+        operations.append(UpdateOne(query, update, upsert=True))
+
+    return operations
+
+
+def _to_raw_bson(documents: list) -> list:
+    raw_documents = []
+    for document in documents:
+        if "_id" not in document:
+            document["_id"] = bson.ObjectId()
+        raw_documents.append(RawBSONDocument(bson.encode(document)))
+
+    return raw_documents
+
+
+def _get_insert_result(documents: list, details: dict, ordered: bool) -> dict:
+    errors = details.get("writeErrors", [])
+    inserted = details.get("nInserted", 0)
+    failed = {error["index"] for error in errors}
+    if ordered:
+        inserted_ids = [document["_id"] for document in documents[:inserted]]
+    else:
+        inserted_ids = [
+            document["_id"]
+            for idx, document in enumerate(documents)
+            if idx not in failed
+        ]
+
+    return {"inserted_ids": inserted_ids, "errors": errors}
+
+
+def _get_bulk_write_result(details: dict) -> dict:
+    return {
+        "inserted_ids": [item["_id"] for item in details.get("upserted", [])],
+        "matched_count": details.get("nMatched", 0),
+        "modified_count": details.get("nModified", 0),
+        "errors": details.get("writeErrors", []),
+    }
+
+
+def _check_write_mode(mode: str, key: Optional[list], raw_bson: bool) -> None:
+    if mode not in write_modes:
+        raise ValueError(f"{mode} not in {write_modes}")
+
+    if mode != "insert":
+        if not key:
+            raise ValueError(f"`key` is required for mode {mode}")
+        if raw_bson:
+            raise ValueError(f"`raw_bson` is not supported for mode {mode}")
+
+
+def _get_index_keys(key: list) -> list:
+    return [(column, pymongo.ASCENDING) for column in key]
+
+
+def _encode_all(data: pd.DataFrame, nulls: str, raw_bson: bool) -> list:
+    documents = encode_frame(data=data, nulls=nulls)
+    if raw_bson:
+        documents = _to_raw_bson(documents=documents)
+
+    return documents
+
+
+def _encode_batch(
+    data: pd.DataFrame, start: int, stop: int, nulls: str, raw_bson: bool
+) -> list:
+    return _encode_all(data=data.iloc[start:stop], nulls=nulls, raw_bson=raw_bson)
+
+
+def _get_batch_bounds(
+    num_rows: int, batch_size: int, workers: int, ordered: bool
+) -> list:
+    if batch_size < 1:
+        raise ValueError(f"`batch_size` must be positive, got {batch_size}")
+    if workers < 1:
+        raise ValueError(f"`workers` must be positive, got {workers}")
+    if ordered and workers > 1:
+        raise ValueError("`ordered` writes need `workers=1`")
+
+    return get_bounds(num_rows=num_rows, size=batch_size)
+
+
+def _get_batch_result(start: int, stop: int, began: float, res: dict):
+    return BatchResult(
+        start=start,
+        stop=stop,
+        inserted_count=len(res["inserted_ids"]),
+        seconds=time.perf_counter() - began,
+        inserted_ids=res["inserted_ids"],
+        errors=res["errors"],
+        matched_count=res.get("matched_count", 0),
+        modified_count=res.get("modified_count", 0),
+    )
+
+
+def _get_frame(documents: list, flatten: bool, sep: str) -> pd.DataFrame:
+    if flatten:
+        return pd.json_normalize(data=documents, sep=sep)
+
+    return pd.DataFrame(data=documents)
+
+
+def encode_documents(
+    data: pd.DataFrame,
+    batch_size: int = 1000,
+    nulls: str = "none",
+    raw_bson: bool = False,
+):
+    """Lazily convert a dataframe to batches of documents.
+    Only one batch of documents exists at a time.
+
+    :param data: Dataframe to convert.
+    :type data: `pd.DataFrame`
+    :param batch_size: Number of documents per batch, defaults to 1000.
+    :type batch_size: `int`, optional
+    :param nulls: How null values are stored, see `encode_frame`, defaults to "none".
+    :type nulls: `str`, optional
+    :param raw_bson: If True, documents are encoded to BSON bytes with ``bson.encode``
+        and wrapped in ``RawBSONDocument``, so pymongo sends them as they are,
+        defaults to False. An ``_id`` is added to documents without one.
+    :type raw_bson: `bool`, optional
+    :return: Generator of lists of at most `batch_size` documents.
+    :rtype: `Iterator[list]`
+
+    >>> from pd_extras.write.nosql_writer import encode_documents
+    >>> for documents in encode_documents(data=data, batch_size=500):
+    >>>     collection.insert_many(documents)
+    """
+
+    if batch_size < 1:
+        raise ValueError(f"`batch_size` must be positive, got {batch_size}")
+
+    for start, stop in get_bounds(num_rows=data.shape[0], size=batch_size):
+        yield _encode_batch(
+            data=data, start=start, stop=stop, nulls=nulls, raw_bson=raw_bson
+        )
+
+
+@dataclass
+class BatchResult:
+    """Outcome of writing one batch of documents.
+
+    ``start`` and ``stop`` are the positional row bounds of the batch.
+    ``errors`` holds the ``writeErrors`` of a ``BulkWriteError``, if any.
+    For upserts, inserted documents are the upserted ones.
+    """
+
+    start: int
+    stop: int
+    inserted_count: int
+    seconds: float
+    inserted_ids: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    matched_count: int = 0
+    modified_count: int = 0
+
+
+@dataclass
+class BatchWriteResult:
+    """Outcome of a batched write with one entry per batch."""
+
+    batches: list = field(default_factory=list)
+
+    @property
+    def inserted_count(self) -> int:
+        """Total number of documents written over all batches."""
+
+        return sum(batch.inserted_count for batch in self.batches)
+
+    @property
+    def inserted_ids(self) -> list:
+        """Ids of all written documents in batch order."""
+
+        return [_id for batch in self.batches for _id in batch.inserted_ids]
+
+    @property
+    def matched_count(self) -> int:
+        """Total number of existing documents matched by upserts."""
+
+        return sum(batch.matched_count for batch in self.batches)
+
+    @property
+    def modified_count(self) -> int:
+        """Total number of existing documents changed by upserts."""
 
-__all__ = ["NoSQLDatabaseWriter"]
+        return sum(batch.modified_count for batch in self.batches)
+
+    @property
+    def failed(self) -> list:
+        """Batches with at least one document that could not be written."""
+
+        return [batch for batch in self.batches if batch.errors]
 
 
 class MongoDatabaseWriter:
@@ -19,8 +309,11 @@ class MongoDatabaseWriter:
         password: str,
         port: int,
         dns_seed_list: bool = False,
+        shared: bool = False,
+        pool_options: Optional[dict] = None,
     ) -> None:
         self._dns_seed_list = dns_seed_list
+        self.__shared = shared
 
         port = int(port)
         self.__client = self._get_mongo_client(
@@ -28,19 +321,33 @@ class MongoDatabaseWriter:
             username=user,
             password=password,
             port=port,
+            pool_options=pool_options,
         )
         self.__dbname: str = dbname
         self.__db = self.__client[dbname]
 
-    def _get_mongo_client(self, host: str, username: str, password: str, port: int):
+    def _get_mongo_client(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        port: int,
+        pool_options: Optional[dict] = None,
+    ):
         service = "mongodb"
 
         if self._dns_seed_list:
             service = f"{service}+srv"
         connection_string: str = f"{service}://{username}:{password}@{host}/"
+        pool_options = pool_options or {}
+
+        if self.__shared:
+            return registry.get_mongo_client(
+                host=connection_string, port=port, **pool_options
+            )
 
         client: pymongo.MongoClient = pymongo.MongoClient(
-            host=connection_string, port=port, document_class=dict
+            host=connection_string, port=port, document_class=dict, **pool_options
         )
 
         return client
@@ -56,13 +363,184 @@ class MongoDatabaseWriter:
 
         return collection
 
-    def _write_data_to_collection(self, data: pd.DataFrame, collection_name: str):
+    def _write_data_to_collection(
+        self,
+        data: pd.DataFrame,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        ordered: bool = True,
+        workers: int = 1,
+        nulls: str = "none",
+        raw_bson: bool = False,
+        mode: str = "insert",
+        key: Optional[list] = None,
+        create_index: bool = True,
+    ):
+        _check_write_mode(mode=mode, key=key, raw_bson=raw_bson)
         collection = self._get_or_create_collection(collection_name=collection_name)
-        documents = data.to_dict("records")
 
-        res = collection.insert_many(documents=documents)
+        if mode != "insert":
+            if create_index:
+                collection.create_index(_get_index_keys(key=key))
+
+            data = data.drop_duplicates(subset=key, keep="last")
+            batch_size = batch_size or 1000
+
+        if batch_size is None:
+            documents = _encode_all(data=data, nulls=nulls, raw_bson=raw_bson)
+
+            return collection.insert_many(documents=documents, ordered=ordered)
+
+        return self._write_batches_to_collection(
+            data=data,
+            collection=collection,
+            batch_size=batch_size,
+            ordered=ordered,
+            workers=workers,
+            nulls=nulls,
+            raw_bson=raw_bson,
+            mode=mode,
+            key=key,
+        )
+
+    def _insert_batch(self, collection, documents: list, ordered: bool) -> dict:
+        try:
+            res = collection.insert_many(documents=documents, ordered=ordered)
+        except BulkWriteError as exc:
+            return _get_insert_result(
+                documents=documents, details=exc.details, ordered=ordered
+            )
+
+        return {"inserted_ids": res.inserted_ids, "errors": []}
 
-        return res
+    def _upsert_batch(
+        self, collection, documents: list, ordered: bool, mode: str, key: list
+    ) -> dict:
+        operations = _get_write_operations(documents=documents, mode=mode, key=key)
+
+        try:
+            details = collection.bulk_write(operations, ordered=ordered).bulk_api_result
+        except BulkWriteError as exc:
+            details = exc.details
+
+        return _get_bulk_write_result(details=details)
+
+    def _write_batch(
+        self,
+        data: pd.DataFrame,
+        collection,
+        start: int,
+        stop: int,
+        ordered: bool,
+        nulls: str,
+        raw_bson: bool,
+        mode: str = "insert",
+        key: Optional[list] = None,
+    ):
+        began = time.perf_counter()
+        documents = _encode_batch(
+            data=data, start=start, stop=stop, nulls=nulls, raw_bson=raw_bson
+        )
+
+        if mode == "insert":
+            res = self._insert_batch(
+                collection=collection, documents=documents, ordered=ordered
+            )
+        else:
+            res = self._upsert_batch(
+                collection=collection,
+                documents=documents,
+                ordered=ordered,
+                mode=mode,
+                key=key,
+            )
+
+        return _get_batch_result(start=start, stop=stop, began=began, res=res)
+
+    def _write_batches_to_collection(
+        self,
+        data: pd.DataFrame,
+        collection,
+        batch_size: int,
+        ordered: bool,
+        workers: int,
+        nulls: str,
+        raw_bson: bool,
+        mode: str = "insert",
+        key: Optional[list] = None,
+    ):
+        bounds = _get_batch_bounds(
+            num_rows=data.shape[0],
+            batch_size=batch_size,
+            workers=workers,
+            ordered=ordered,
+        )
+        if ordered:
+            batches = []
+            for start, stop in bounds:
+                batches.append(
+                    self._write_batch(
+                        data=data,
+                        collection=collection,
+                        start=start,
+                        stop=stop,
+                        ordered=ordered,
+                        nulls=nulls,
+                        raw_bson=raw_bson,
+                        mode=mode,
+                        key=key,
+                    )
+                )
+                if batches[-1].errors:
+                    break
+
+            return BatchWriteResult(batches=batches)
+
+        batches = bounded_map(
+            func=lambda bound: self._write_batch(
+                data=data,
+                collection=collection,
+                start=bound[0],
+                stop=bound[1],
+                ordered=ordered,
+                nulls=nulls,
+                raw_bson=raw_bson,
+                mode=mode,
+                key=key,
+            ),
+            items=bounds,
+            workers=workers,
+            max_pending=2 * workers,
+        )
+
+        return BatchWriteResult(batches=sorted(batches, key=lambda batch: batch.start))
+
+    def _read_collection(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        projection=None,
+        batch_size: int = 1000,
+        flatten: bool = False,
+        sep: str = ".",
+    ):
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, got {batch_size}")
+
+        collection = self._get_or_create_collection(collection_name=collection_name)
+        cursor = collection.find(
+            filter=filter or {}, projection=projection, batch_size=batch_size
+        )
+
+        try:
+            while True:
+                documents = list(itertools.islice(cursor, batch_size))
+                if not documents:
+                    break
+
+                yield _get_frame(documents=documents, flatten=flatten, sep=sep)
+        finally:
+            cursor.close()
 
     def _get_document_count(self, collection_name: str):
         collection = self._get_or_create_collection(collection_name=collection_name)
@@ -76,11 +554,18 @@ class MongoDatabaseWriter:
         self.__client.drop_database(name_or_database=self.__dbname)
 
     def _close_connection(self):
-        self.__client.close()
+        if self.__shared:
+            registry.release(self.__client)
+        else:
+            self.__client.close()
 
 
 class NoSQLDatabaseWriter:
-    """Writer class for NoSQL Database"""
+    """Writer class for NoSQL Database
+    With `shared=True`, the client comes from the process-wide registry and is
+    shared with every other writer using the same credentials and `pool_options`
+    (options of ``pymongo.MongoClient`` such as ``maxPoolSize``).
+    """
 
     def __init__(
         self,
@@ -91,6 +576,8 @@ class NoSQLDatabaseWriter:
         password: str,
         port: int,
         dns_seed_list: bool = False,
+        shared: bool = False,
+        pool_options: Optional[dict] = None,
     ) -> None:
         if dbtype not in nosql_dbtypes:
             raise ValueError(f"{dbtype} not in {nosql_dbtypes}")
@@ -104,6 +591,8 @@ class NoSQLDatabaseWriter:
             password=password,
             port=port,
             dns_seed_list=dns_seed_list,
+            shared=shared,
+            pool_options=pool_options,
         )
 
     def _get_writer(
@@ -114,6 +603,8 @@ class NoSQLDatabaseWriter:
         password: str,
         port: int,
         dns_seed_list: bool = False,
+        shared: bool = False,
+        pool_options: Optional[dict] = None,
     ):
         if self.__dbtype == "mongo":
             return MongoDatabaseWriter(
@@ -123,6 +614,8 @@ class NoSQLDatabaseWriter:
                 password=password,
                 port=port,
                 dns_seed_list=dns_seed_list,
+                shared=shared,
+                pool_options=pool_options,
             )
 
         return None
@@ -156,19 +649,121 @@ class NoSQLDatabaseWriter:
 
         return self.__writer._get_or_create_collection(collection_name=collection_name)
 
-    def write_data_to_collection(self, collection_name: str, data: pd.DataFrame):
+    def write_data_to_collection(
+        self,
+        collection_name: str,
+        data: pd.DataFrame,
+        batch_size: Optional[int] = None,
+        ordered: Optional[bool] = None,
+        workers: int = 1,
+        nulls: str = "none",
+        raw_bson: bool = False,
+        mode: str = "insert",
+        key: Optional[list] = None,
+        create_index: bool = True,
+    ):
         """Write dataframe `data` to the collection `collection_name`.
 
         :param collection_name: Name of the collection.
         :type collection_name: `str`
         :param data: Dataframe to write.
         :type data: `pd.DataFrame`
+        :param batch_size: If set, write `data` in batches of `batch_size` documents,
+            each with its own ``insert_many``, defaults to None.
+        :type batch_size: `int`, optional
+        :param ordered: If False, the server keeps writing after a failed document
+            and may write documents in parallel. If True, the write stops at the
+            first failed document and batches after it are not sent, so they are
+            missing from the result. Needs `workers=1`. Defaults to True for
+            "insert" with one worker and False otherwise.
+        :type ordered: `bool`, optional
+        :param workers: Number of batches written concurrently over the pooled
+            client, defaults to 1. Only used with `batch_size`.
+        :type workers: `int`, optional
+        :param nulls: "none" to store null values as ``None``, "drop" to leave
+            the key out of the document, defaults to "none".
+        :type nulls: `str`, optional
+        :param raw_bson: If True, documents are encoded to BSON before they are
+            handed to pymongo, defaults to False.
+        :type raw_bson: `bool`, optional
+        :param mode: "insert" to add new documents, "upsert" to update the document
+            with the same `key` fields or insert it, "replace" to replace the whole
+            document with the same `key` fields or insert it, defaults to "insert".
+            Upserts and replacements are sent with ``bulk_write`` in batches of
+            `batch_size`, 1000 if not given. If a key appears more than once in
+            `data`, the last row is used. An ``_id`` in `data` is used for new
+            documents. With "replace", it is also kept in the replacement, so
+            a document with another ``_id`` is reported as a write error.
+        :type mode: `str`, optional
+        :param key: Fields identifying a document, required unless `mode` is "insert".
+        :type key: `list`, optional
+        :param create_index: If True, an index on `key` is created first unless it
+            exists, so upserts do not scan the collection, defaults to True.
+        :type create_index: `bool`, optional
         :return: Object with ids of inserted documents.
-        :rtype: `pymongo.results.InsertManyResult`
+            With `batch_size` or another `mode`, per-batch counts, ids and write
+            errors. Batches with failed documents are reported in `failed`
+            instead of raising.
+        :rtype: `pymongo.results.InsertManyResult` or `BatchWriteResult`
         """
 
+        if ordered is None:
+            ordered = mode == "insert" and workers == 1
+
         return self.__writer._write_data_to_collection(
-            collection_name=collection_name, data=data
+            collection_name=collection_name,
+            data=data,
+            batch_size=batch_size,
+            ordered=ordered,
+            workers=workers,
+            nulls=nulls,
+            raw_bson=raw_bson,
+            mode=mode,
+            key=key,
+            create_index=create_index,
+        )
+
+    def read_collection(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        projection=None,
+        batch_size: int = 1000,
+        flatten: bool = False,
+        sep: str = ".",
+    ):
+        """Read documents of the collection `collection_name` in chunks.
+        Documents are fetched from the server `batch_size` at a time and each
+        batch is turned into a dataframe, so only one batch is held in memory.
+
+        :param collection_name: Name of the collection.
+        :type collection_name: `str`
+        :param filter: Query the documents must match, defaults to all documents.
+        :type filter: `dict`, optional
+        :param projection: Fields to return, as a list of names or a dict
+            like ``{"_id": 0, "name": 1}``. Applied by the server, defaults to None.
+        :type projection: `list` or `dict`, optional
+        :param batch_size: Number of documents per dataframe, defaults to 1000.
+        :type batch_size: `int`, optional
+        :param flatten: If True, nested documents are flattened into columns
+            like ``parent.child`` with ``pd.json_normalize``, defaults to False.
+        :type flatten: `bool`, optional
+        :param sep: Separator of flattened column names, defaults to ".".
+        :type sep: `str`, optional
+        :return: Generator of dataframes with at most `batch_size` rows.
+        :rtype: `Iterator[pd.DataFrame]`
+
+        >>> for chunk in conn.read_collection(collection_name, projection=["name"]):
+        >>>     process(chunk)
+        """
+
+        return self.__writer._read_collection(
+            collection_name=collection_name,
+            filter=filter,
+            projection=projection,
+            batch_size=batch_size,
+            flatten=flatten,
+            sep=sep,
         )
 
     def get_document_count(self, collection_name: str):
@@ -197,6 +792,8 @@ class NoSQLDatabaseWriter:
         self.__writer._delete_database()
 
     def close_connection(self):
-        """Close the current connection."""
+        """Close the current connection.
+        A shared client is only closed when no other writer holds it.
+        """
 
         self.__writer._close_connection()
@@ -0,0 +1,167 @@
+"""Share database engines and clients between writers"""
+
+import atexit
+import threading
+from typing import Optional
+
+import pymongo
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+__all__ = ["ConnectionRegistry", "registry"]
+
+
+class ConnectionRegistry:
+    """Process-wide store of SQLAlchemy engines and Mongo clients.
+    Writers asking for the same connection parameters get the same object
+    and therefore the same connection pool. Every object is reference counted:
+    it is disposed when the last writer releases it, and whatever is left is
+    disposed when the process exits.
+
+    >>> from pd_extras.write.registry import registry
+    >>> engine = registry.get_engine(url=url, pool_size=10, pool_pre_ping=True)
+    >>> registry.release(engine)
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__entries: dict = {}
+        self.__keys: dict = {}
+
+    def _acquire(self, key: tuple, factory):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = [factory(), 0]
+                self.__entries[key] = entry
+                self.__keys[id(entry[0])] = key
+            entry[1] += 1
+
+            return entry[0]
+
+    def get_engine(
+        self,
+        url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = False,
+        pool_recycle: int = -1,
+        connect_args: Optional[dict] = None,
+    ) -> Engine:
+        """Get a shared engine for `url`.
+
+        :param url: Database url.
+        :type url: `str`
+        :param pool_size: Number of connections kept open, defaults to 5.
+        :type pool_size: `int`, optional
+        :param max_overflow: Number of connections opened on top of `pool_size`
+            under load, defaults to 10.
+        :type max_overflow: `int`, optional
+        :param pool_pre_ping: If True, connections are tested before they are
+            handed out, defaults to False.
+        :type pool_pre_ping: `bool`, optional
+        :param pool_recycle: Seconds after which a connection is replaced,
+            defaults to -1 (never).
+        :type pool_recycle: `int`, optional
+        :param connect_args: Extra arguments for the driver, defaults to None.
+        :type connect_args: `dict`, optional
+        :return: Engine shared by every caller with the same arguments.
+        :rtype: `sqlalchemy.engine.Engine`
+        """
+
+        connect_args = connect_args or {}
+        key = (
+            "sqlalchemy",
+            url,
+            pool_size,
+            max_overflow,
+            pool_pre_ping,
+            pool_recycle,
+            tuple(sorted(connect_args.items())),
+        )
+
+        return self._acquire(
+            key=key,
+            factory=lambda: create_engine(
+                url,
+                future=True,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+                connect_args=connect_args,
+            ),
+        )
+
+    def get_mongo_client(self, host: str, port: int, **options) -> pymongo.MongoClient:
+        """Get a shared Mongo client.
+
+        :param host: Connection string.
+        :type host: `str`
+        :param port: Port number.
+        :type port: `int`
+        :param options: Options of ``pymongo.MongoClient``, e.g. ``maxPoolSize``.
+        :return: Client shared by every caller with the same arguments.
+        :rtype: `pymongo.MongoClient`
+        """
+
+        options.setdefault("document_class", dict)
+        key = ("mongo", host, port, tuple(sorted(options.items(), key=str)))
+
+        return self._acquire(
+            key=key,
+            factory=lambda: pymongo.MongoClient(host=host, port=port, **options),
+        )
+
+    def release(self, resource) -> None:
+        """Give back an engine or client. It is disposed when no one holds it.
+
+        :param resource: Engine or client from this registry.
+        :raises ValueError: If `resource` does not belong to this registry.
+        """
+
+        with self.__lock:
+            key = self.__keys.get(id(resource))
+            if key is None:
+                raise ValueError(f"{resource} not in registry")
+
+            entry = self.__entries[key]
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+
+            del self.__entries[key]
+            del self.__keys[id(resource)]
+
+        self._dispose(resource=resource)
+
+    def get_reference_count(self, resource) -> int:
+        """Number of holders of `resource`, 0 if it is not in the registry."""
+
+        with self.__lock:
+            key = self.__keys.get(id(resource))
+            if key is None:
+                return 0
+
+            return self.__entries[key][1]
+
+    def _dispose(self, resource) -> None:
+        if isinstance(resource, Engine):
+            resource.dispose()
+        else:
+            resource.close()
+
+    def dispose_all(self) -> None:
+        """Dispose every engine and client regardless of its holders."""
+
+        with self.__lock:
+            resources = [entry[0] for entry in self.__entries.values()]
+            self.__entries.clear()
+            self.__keys.clear()
+
+        for resource in resources:
+            self._dispose(resource=resource)
+
+
+registry = ConnectionRegistry()
+atexit.register(registry.dispose_all)
@@ -1,16 +1,36 @@
 """Write a pandas dataframe to a SQL database table"""
 
 
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
 import pandas as pd
-from pandas.api.types import is_integer_dtype, is_numeric_dtype  # type: ignore
-from pd_extras.write.common import saved_values
+import pyarrow as pa
+from pandas.api.types import (  # type: ignore
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_integer_dtype,
+    is_numeric_dtype,
+)
+from pd_extras.check.sanitize import check_column_collisions
+from pd_extras.write.common import bounded_map, get_bounds, saved_values
+from pd_extras.write.loaders import MySQLLoadDataLoader, get_loader, to_records
+from pd_extras.write.registry import registry
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     Column,
+    DateTime,
     Float,
     Integer,
     MetaData,
+    SmallInteger,
     String,
     Table,
+    UniqueConstraint,
     create_engine,
     text,
 )
@@ -18,6 +38,304 @@ from sqlalchemy.orm import Session
 from sqlalchemy_utils import create_database, database_exists
 
 
+@dataclass
+class ChunkResult:
+    """Outcome of writing one slice of a dataframe.
+
+    ``start`` and ``stop`` are the positional row bounds of the slice.
+    """
+
+    start: int
+    stop: int
+    rowcount: int
+    seconds: float
+    attempts: int = 1
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class WriteResult:
+    """Outcome of a chunked write with one entry per chunk."""
+
+    chunks: list = field(default_factory=list)
+
+    @property
+    def failed(self) -> list:
+        """Chunks that could not be written."""
+
+        return [chunk for chunk in self.chunks if chunk.error is not None]
+
+    @property
+    def rowcount(self) -> int:
+        """Total number of rows written over all chunks."""
+
+        return sum(chunk.rowcount for chunk in self.chunks)
+
+    @property
+    def seconds(self) -> float:
+        """Total time spent writing chunks."""
+
+        return sum(chunk.seconds for chunk in self.chunks)
+
+
+class ChunkWriteError(Exception):
+    """Raised when a chunk of a chunked write fails.
+    Chunks committed before the failure stay in the table.
+
+    :param result: Chunks attempted so far, the failed one last with its `error`.
+    :type result: `WriteResult`
+    :param index: Position of the failed chunk in `result.chunks`.
+    :type index: `int`
+    :param committed: Number of leading chunks of `result` that were committed.
+        The others were rolled back.
+    :type committed: `int`
+    """
+
+    def __init__(self, result: WriteResult, index: int, committed: int) -> None:
+        self.result = result
+        self.index = index
+        self.committed = committed
+        chunk = result.chunks[index]
+        super().__init__(
+            f"Chunk {index} (rows {chunk.start}:{chunk.stop}) failed after "
+            f"{committed} committed chunks: {chunk.error!r}"
+        )
+
+    @property
+    def committed_rows(self) -> int:
+        """Number of rows committed before the failure."""
+
+        return sum(chunk.rowcount for chunk in self.result.chunks[: self.committed])
+
+
+class _ChunkedWrite:
+    """Chunk bounds, commit points and results of a chunked write.
+    Shared by the sync and async writers, which only add the I/O.
+    """
+
+    def __init__(self, num_rows: int, chunksize: int, commit_every: int) -> None:
+        if chunksize < 1:
+            raise ValueError(f"`chunksize` must be positive, got {chunksize}")
+        if commit_every < 1:
+            raise ValueError(f"`commit_every` must be positive, got {commit_every}")
+
+        self.bounds = get_bounds(num_rows=num_rows, size=chunksize)
+        self.commit_every = commit_every
+        self.result = WriteResult()
+        self.committed = 0
+        self.__began = 0.0
+
+    def __iter__(self):
+        for start, stop in self.bounds:
+            self.__began = time.perf_counter()
+            self.result.chunks.append(
+                ChunkResult(start=start, stop=stop, rowcount=0, seconds=0.0)
+            )
+
+            yield start, stop
+
+    def loaded(self, rowcount: int) -> bool:
+        """Record the rows of the current chunk.
+
+        :return: True if the chunks so far should be committed now.
+        """
+
+        chunk = self.result.chunks[-1]
+        chunk.rowcount = rowcount
+        chunk.seconds = time.perf_counter() - self.__began
+        count = len(self.result.chunks)
+
+        return count % self.commit_every == 0 or count == len(self.bounds)
+
+    def commit(self) -> None:
+        """Mark the chunks so far as committed."""
+
+        self.committed = len(self.result.chunks)
+
+    def fail(self, error: BaseException) -> ChunkWriteError:
+        """Record `error` on the current chunk.
+
+        :return: Error to raise, holding the result so far.
+        """
+
+        chunk = self.result.chunks[-1]
+        chunk.error = error
+        chunk.seconds = time.perf_counter() - self.__began
+
+        return ChunkWriteError(
+            result=self.result,
+            index=len(self.result.chunks) - 1,
+            committed=self.committed,
+        )
+
+
+class _PartitionWrite:
+    """Attempts and result of writing one partition with retries.
+    Shared by the sync and async writers, which only add the I/O.
+    """
+
+    def __init__(self, start: int, stop: int, retries: int) -> None:
+        self.start = start
+        self.stop = stop
+        self.retries = retries
+        self.attempts = 0
+        self.rowcount = 0
+        self.error: Optional[BaseException] = None
+        self.__began = time.perf_counter()
+        self.__done = False
+
+    def __iter__(self):
+        while not self.__done and self.attempts <= self.retries:
+            self.attempts += 1
+
+            yield self.attempts
+
+    def succeeded(self, rowcount: int) -> None:
+        """Record a successful attempt."""
+
+        self.rowcount = rowcount
+        self.error = None
+        self.__done = True
+
+    def failed(self, error: BaseException) -> None:
+        """Record a failed attempt."""
+
+        self.rowcount = 0
+        self.error = error
+
+    @property
+    def result(self) -> ChunkResult:
+        """Outcome of the last attempt."""
+
+        return ChunkResult(
+            start=self.start,
+            stop=self.stop,
+            rowcount=self.rowcount,
+            seconds=time.perf_counter() - self.__began,
+            attempts=self.attempts,
+            error=self.error,
+        )
+
+
+_MISSING = object()
+_concat_options = (
+    {"promote_options": "default"}
+    if int(pa.__version__.split(".")[0]) >= 14
+    else {"promote": True}
+)
+_existing_databases: set = set()
+_existing_databases_lock = threading.Lock()
+
+
+def arrow_to_pandas(table: pa.Table, zero_copy: bool = True) -> pd.DataFrame:
+    """Convert a pyarrow table to a pandas dataframe.
+
+    :param table: Arrow table, e.g. from `SQLDatabaseWriter.get_arrow_from_query`.
+    :type table: `pa.Table`
+    :param zero_copy: If True, columns are backed by the Arrow buffers
+        (``pd.ArrowDtype``) instead of being copied to numpy, defaults to True.
+    :type zero_copy: `bool`, optional
+    :return: Pandas dataframe.
+    :rtype: `pd.DataFrame`
+    """
+
+    if zero_copy:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    return table.to_pandas()
+
+
+def _concat_tables(tables: list) -> pa.Table:
+    # ``promote`` was replaced by ``promote_options`` in pyarrow 14
+    return pa.concat_tables(tables, **_concat_options)
+
+
+def _ensure_database_exists(url) -> None:
+    key = url.render_as_string(hide_password=True)
+    with _existing_databases_lock:
+        if key in _existing_databases:
+            return
+
+        if not database_exists(url=url):
+            create_database(url)
+        _existing_databases.add(key)
+
+
+@lru_cache(maxsize=65536)
+def _strip_column(column) -> str:
+    return str(column).strip().strip('"')
+
+
+def _get_column_type(dtype, max_length: int):
+    if is_bool_dtype(dtype):
+        return Boolean
+    if is_integer_dtype(dtype):
+        bits = 8 * dtype.itemsize + (dtype.kind == "u")
+        if bits <= 16:
+            return SmallInteger
+        if bits <= 32:
+            return Integer
+
+        return BigInteger
+    if is_numeric_dtype(dtype):
+        return Float(precision=24 if dtype.itemsize <= 4 else 53)
+    if is_datetime64_any_dtype(dtype):
+        return DateTime
+
+    return String(max_length)
+
+
+class SchemaCache:
+    """Cache of table metadata keyed by ``(dbname, table_name)``.
+    Each key holds one value per kind of lookup, e.g. column info or
+    table existence. Values expire `ttl` seconds after they were stored.
+    A `ttl` of 0 disables caching.
+    """
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries: dict = {}
+        self.__lock = threading.Lock()
+
+    def get(self, dbname: str, table_name: str, kind: str):
+        """Get a cached value.
+
+        :return: The value or ``_MISSING`` if absent or expired.
+        """
+
+        with self.__lock:
+            entry = self.__entries.get((dbname, table_name), {}).get(kind)
+            if entry is None or time.monotonic() >= entry[0]:
+                self.misses += 1
+                return _MISSING
+
+            self.hits += 1
+            return entry[1]
+
+    def set(self, dbname: str, table_name: str, kind: str, value) -> None:
+        """Store a value for `ttl` seconds."""
+
+        if self.ttl <= 0:
+            return
+
+        with self.__lock:
+            entries = self.__entries.setdefault((dbname, table_name), {})
+            entries[kind] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(
+        self, dbname: Optional[str] = None, table_name: Optional[str] = None
+    ) -> None:
+        """Drop cached values of `table_name`, or of every table if not given."""
+
+        with self.__lock:
+            if table_name is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop((dbname, table_name), None)
+
+
 class SQLDatabaseWriter:
     """Database connection object for SQL databases
     Only database name `dbname` is stored.
@@ -25,6 +343,17 @@ class SQLDatabaseWriter:
     Two connections are created: one for the specific database `dbname`
     and another generic connection with no database selected.
     Be sure to call `connobj.close_connection()` after you are done.
+    Table schemas and existence checks are cached per writer for
+    `schema_cache_ttl` seconds. Set it to 0 to always query the database.
+    With `shared=True`, the engine comes from the process-wide registry and is
+    shared with every other writer using the same credentials and `pool_options`
+    (`pool_size`, `max_overflow`, `pool_pre_ping`, `pool_recycle`).
+    The database is created if it does not exist. The check is done once per
+    database url for the life of the process. With `lazy=True` it is deferred
+    to the first write, and with `assume_exists=True` it is skipped.
+    MySQL connections only allow ``LOAD DATA LOCAL INFILE``, used by the "native"
+    write `method`, with `local_infile=True`. Only enable it for trusted servers,
+    as it lets the server read files of the client.
     """
 
     def __init__(
@@ -35,11 +364,21 @@ class SQLDatabaseWriter:
         user: str,
         password: str,
         port: int,
+        schema_cache_ttl: float = 60.0,
+        shared: bool = False,
+        pool_options: Optional[dict] = None,
+        lazy: bool = False,
+        assume_exists: bool = False,
+        local_infile: bool = False,
     ):
         assert dbtype in saved_values, f"{dbtype} not in {list(saved_values.keys())}"
         assert dbname is not None, "`dbname` must be a valid database name"
         self.__dbtype = dbtype
         self.__dbname = dbname
+        self.__schema_cache = SchemaCache(ttl=schema_cache_ttl)
+        self.__shared = shared
+        self.__assume_exists = assume_exists
+        self.__local_infile = local_infile
         port = int(port)
 
         self.__engine = self._get_db_specific_engine(
@@ -47,12 +386,44 @@ class SQLDatabaseWriter:
             user=user,
             password=password,
             port=port,
+            pool_options=pool_options,
         )
 
-        if not database_exists(url=self.__engine.url):
-            create_database(self.__engine.url)
+        if not lazy:
+            self._ensure_database()
 
-    def _get_db_specific_engine(self, host: str, user: str, password: str, port: int):
+    def _ensure_database(self) -> None:
+        if self.__assume_exists:
+            return
+
+        _ensure_database_exists(url=self.__engine.url)
+
+    def _get_connect_args(self) -> dict:
+        values = saved_values[self.__dbtype]
+        connect_args = dict(values.get("connect_args", {}))
+        if self.__local_infile:
+            connect_args.update(values.get("local_infile_args", {}))
+
+        return connect_args
+
+    def _get_loader(self, method: str):
+        loader = get_loader(dbtype=self.__dbtype, method=method)
+        if isinstance(loader, MySQLLoadDataLoader) and not self.__local_infile:
+            raise ValueError(
+                "LOAD DATA LOCAL INFILE is disabled, create the writer with "
+                "`local_infile=True` to use it"
+            )
+
+        return loader
+
+    def _get_db_specific_engine(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        port: int,
+        pool_options: Optional[dict] = None,
+    ):
         dialect = saved_values[self.__dbtype]["dialect"]
         driver = saved_values[self.__dbtype]["driver"]
 
@@ -60,7 +431,20 @@ class SQLDatabaseWriter:
             f"{dialect}{driver}://{user}:{password}@{host}:{port}/{self.__dbname}"
         )
 
-        engine = create_engine(connection_string, future=True)
+        connect_args = self._get_connect_args()
+        pool_options = pool_options or {}
+
+        if self.__shared:
+            return registry.get_engine(
+                url=connection_string, connect_args=connect_args, **pool_options
+            )
+
+        engine = create_engine(
+            connection_string,
+            future=True,
+            connect_args=connect_args,
+            **pool_options,
+        )
 
         return engine
 
@@ -76,6 +460,149 @@ class SQLDatabaseWriter:
         with self.__engine.connect() as conn:
             return pd.read_sql(sql=text(query), con=conn)
 
+    def iter_query(
+        self,
+        query: str,
+        chunksize: int = 10_000,
+        dtypes: Optional[dict] = None,
+    ):
+        """Execute a single query and get the result in chunks.
+        Rows are fetched through a server-side cursor (``stream_results``),
+        i.e. a named cursor on psycopg2 and ``SSCursor`` on mysql, so only
+        one chunk is held in memory at a time.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :param chunksize: Number of rows per chunk, defaults to 10_000.
+        :type chunksize: `int`, optional
+        :param dtypes: Mapping of column names to dtypes to cast each chunk to,
+            defaults to None.
+        :type dtypes: `dict`, optional
+        :return: Generator of pandas dataframes with at most `chunksize` rows.
+        :rtype: `Iterator[pd.DataFrame]`
+
+        >>> for chunk in conn.iter_query(query=query, chunksize=1000):
+        >>>     process(chunk)
+        """
+
+        if chunksize < 1:
+            raise ValueError(f"`chunksize` must be positive, got {chunksize}")
+
+        with self.__engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            for chunk in pd.read_sql(sql=text(query), con=conn, chunksize=chunksize):
+                if dtypes:
+                    chunk = chunk.astype(
+                        {
+                            column: dtype
+                            for column, dtype in dtypes.items()
+                            if column in chunk.columns
+                        }
+                    )
+
+                yield chunk
+
+    def _fetch_arrow_batches(
+        self, result, batch_size: int, schema: Optional[pa.Schema] = None
+    ):
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, got {batch_size}")
+
+        names = list(result.keys())
+        while True:
+            rows = result.fetchmany(batch_size)
+            if not rows:
+                break
+
+            batch = self._get_arrow_batch(rows=rows, names=names, schema=schema)
+            schema = batch.schema
+
+            yield batch
+
+    def _get_arrow_batch(
+        self, rows: list, names: list, schema: Optional[pa.Schema] = None
+    ) -> pa.RecordBatch:
+        columns = zip(*rows)
+        if schema is None:
+            arrays = [pa.array(column) for column in columns]
+        else:
+            arrays = [
+                pa.array(column)
+                if pa.types.is_null(field.type)
+                else pa.array(column, type=field.type)
+                for column, field in zip(columns, schema)
+            ]
+
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+
+    def iter_arrow_batches(
+        self,
+        query: str,
+        batch_size: int = 10_000,
+        schema: Optional[pa.Schema] = None,
+    ):
+        """Execute a single query and get the result as Arrow record batches.
+        Each fetch from a server-side cursor is transposed into columns and
+        converted straight to Arrow arrays, without building dataframes.
+        The schema is inferred from the first batch unless given, and later
+        batches are converted to it. Columns that were entirely null in the
+        first batch are typed on the first batch that has a value.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :param batch_size: Number of rows per batch, defaults to 10_000.
+        :type batch_size: `int`, optional
+        :param schema: Arrow schema of the result, defaults to None.
+        :type schema: `pa.Schema`, optional
+        :return: Generator of record batches with at most `batch_size` rows.
+        :rtype: `Iterator[pa.RecordBatch]`
+        """
+
+        with self.__engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            result = conn.execute(text(query))
+
+            yield from self._fetch_arrow_batches(
+                result=result, batch_size=batch_size, schema=schema
+            )
+
+    def get_arrow_from_query(
+        self,
+        query: str,
+        batch_size: int = 10_000,
+        schema: Optional[pa.Schema] = None,
+    ) -> pa.Table:
+        """Execute a single query on the current database.
+
+        :param query: SQL statement to execute.
+        :type query: `str`
+        :param batch_size: Number of rows fetched at a time, defaults to 10_000.
+        :type batch_size: `int`, optional
+        :param schema: Arrow schema of the result, defaults to None.
+        :type schema: `pa.Schema`, optional
+        :return: Arrow table with result of query.
+            Use `arrow_to_pandas` to get a pandas dataframe.
+        :rtype: `pa.Table`
+        """
+
+        with self.__engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            result = conn.execute(text(query))
+
+            tables = [
+                pa.Table.from_batches([batch])
+                for batch in self._fetch_arrow_batches(
+                    result=result, batch_size=batch_size, schema=schema
+                )
+            ]
+            if not tables:
+                if schema is None:
+                    schema = pa.schema([(name, pa.null()) for name in result.keys()])
+
+                return schema.empty_table()
+
+        return _concat_tables(tables=tables)
+
     def get_list_of_database(self):
         """Get list of databases.
 
@@ -99,12 +626,18 @@ class SQLDatabaseWriter:
         :rtype: ``pd.DataFrame``
         """
 
-        sa_session = Session(self.__engine)
-        _saved_values: dict = saved_values[self.__dbtype]
-
         self._check_name(name=self.__dbname)
         self._check_name(name=table_name)
 
+        cached = self.__schema_cache.get(
+            dbname=self.__dbname, table_name=table_name, kind="column_info"
+        )
+        if cached is not _MISSING:
+            return cached.copy()
+
+        sa_session = Session(self.__engine)
+        _saved_values: dict = saved_values[self.__dbtype]
+
         query: str = _saved_values["query"]["column_info"] % (
             self.__dbname,
             table_name,
@@ -121,7 +654,11 @@ class SQLDatabaseWriter:
 
         session.close()
 
-        return info
+        self.__schema_cache.set(
+            dbname=self.__dbname, table_name=table_name, kind="column_info", value=info
+        )
+
+        return info.copy()
 
     def has_table(self, table_name: str):
         """Check if the current database has table `table_name`.
@@ -132,34 +669,77 @@ class SQLDatabaseWriter:
         :rtype: `bool`
         """
 
+        cached = self.__schema_cache.get(
+            dbname=self.__dbname, table_name=table_name, kind="has_table"
+        )
+        if cached is not _MISSING:
+            return cached
+
         with self.__engine.connect() as connection:
             if "server" in self.__dbtype:
-                return self.__engine.dialect.has_table(
+                exists = self.__engine.dialect.has_table(
                     connection=connection, tablename=table_name
                 )
             else:
-                return self.__engine.dialect.has_table(
+                exists = self.__engine.dialect.has_table(
                     connection=connection, table_name=table_name
                 )
 
-    def _check_null(self, data: pd.DataFrame, info: pd.DataFrame, id_col: str):
-        columns = info["column_name"].to_numpy()
-        nullable_status = info["is_nullable"].to_numpy()
+        self.__schema_cache.set(
+            dbname=self.__dbname, table_name=table_name, kind="has_table", value=exists
+        )
+
+        return exists
+
+    @property
+    def schema_cache(self) -> SchemaCache:
+        """Schema cache of this writer with its `hits` and `misses` counters."""
+
+        return self.__schema_cache
 
-        columns_valid = []
-        for column, status in zip(columns, nullable_status):
-            if id_col == column:
-                continue
-            if column not in data.columns:
-                raise ValueError(f"{column} not in columns: {data.columns.tolist()}")
+    def invalidate_schema_cache(self, table_name: Optional[str] = None):
+        """Forget cached schema information.
 
-            if status.lower() == "no":
-                if data[column].dropna().shape[0] < data.shape[0]:
-                    raise ValueError(f"`{column}` is non-nullable but has null value")
-            columns_valid.append(column)
+        :param table_name: Table to forget, defaults to every table.
+        :type table_name: `str`, optional
+        """
+
+        self.__schema_cache.invalidate(dbname=self.__dbname, table_name=table_name)
+
+    def _get_null_counts(self, data: pd.DataFrame) -> pd.Series:
+        return data.isna().sum()
 
-        data = data[columns_valid].copy()
-        data = data.reset_index(drop=True)
+    def _check_null(
+        self,
+        data: pd.DataFrame,
+        info: pd.DataFrame,
+        id_col: str,
+        null_counts: Optional[pd.Series] = None,
+    ):
+        if null_counts is None:
+            null_counts = self._get_null_counts(data=data)
+
+        info = info[info["column_name"] != id_col]
+        columns = info["column_name"].tolist()
+
+        missing = info["column_name"][~info["column_name"].isin(data.columns)]
+        if missing.shape[0] > 0:
+            raise ValueError(
+                f"{missing.tolist()} not in columns: {data.columns.tolist()}"
+            )
+
+        non_nullable = info["column_name"][info["is_nullable"].str.lower() == "no"]
+        has_null = null_counts[non_nullable] > 0
+        if has_null.any():
+            columns_with_null = has_null[has_null].index.tolist()
+            raise ValueError(
+                f"{columns_with_null} are non-nullable but have null values"
+            )
+
+        if data.columns.tolist() != columns:
+            data = data[columns]
+        if not data.index.equals(pd.RangeIndex(data.shape[0])):
+            data = data.reset_index(drop=True)
 
         return data
 
@@ -169,10 +749,13 @@ class SQLDatabaseWriter:
                 raise ValueError(f"Unacceptable character {char} found in {name}")
 
     def _clean_column(self, column: str):
-        return str(column).strip().strip('"')
+        return _strip_column(column)
 
     def _clean_columns(self, data: pd.DataFrame):
-        data.columns = [self._clean_column(column) for column in data.columns]  # type: ignore
+        columns = data.columns.tolist()
+        clean_columns = [self._clean_column(column) for column in columns]
+        check_column_collisions(columns=columns, clean_columns=clean_columns)
+        data.columns = clean_columns  # type: ignore
 
         return data
 
@@ -182,38 +765,43 @@ class SQLDatabaseWriter:
         table_name: str,
         id_col: str,
         max_length: int = 100,
+        null_counts: Optional[pd.Series] = None,
+        unique_columns: Optional[list] = None,
     ):
+        if null_counts is None:
+            null_counts = self._get_null_counts(data=data)
+
         metadata = MetaData(self.__engine)
         columns = []
 
         if id_col:
             columns.append(Column(id_col, Integer, primary_key=True, nullable=False))
 
-        for column in data.columns:
-            nullable_status = False
-            if data[column].dropna().shape[0] < data.shape[0]:
-                nullable_status = True
-
-            if is_integer_dtype(data[column]):
-                columns.append(Column(column, Integer, nullable=nullable_status))
-            elif is_numeric_dtype(data[column]):
-                columns.append(Column(column, Float, nullable=nullable_status))
-            else:
-                columns.append(
-                    Column(column, String(max_length), nullable=nullable_status)
+        for column, dtype in data.dtypes.items():
+            columns.append(
+                Column(
+                    column,
+                    _get_column_type(dtype=dtype, max_length=max_length),
+                    nullable=bool(null_counts[column] > 0),
                 )
+            )
+
+        if unique_columns:
+            columns.append(UniqueConstraint(*unique_columns))
 
         table = Table(table_name, metadata, *columns)
 
         return table
 
     def _create_new_table(self, table: Table):
-        table.create(bind=self.__engine, checkfirst=True)
+        if not self.has_table(table_name=table.name):
+            table.create(bind=self.__engine, checkfirst=True)
+            self.invalidate_schema_cache(table_name=table.name)
 
         return table
 
     def _write_data_to_table(self, data: pd.DataFrame, table: Table):
-        records = data.to_dict("records")
+        records = to_records(data=data)
 
         with self.__engine.connect() as conn:
             ins = table.insert()
@@ -223,6 +811,149 @@ class SQLDatabaseWriter:
 
             return result
 
+    def _write_data_in_chunks(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        chunksize: int,
+        commit_every: int = 1,
+        method: str = "executemany",
+    ):
+        chunked = _ChunkedWrite(
+            num_rows=data.shape[0], chunksize=chunksize, commit_every=commit_every
+        )
+        loader = self._get_loader(method=method)
+
+        with self.__engine.connect() as conn:
+            for start, stop in chunked:
+                try:
+                    rowcount = loader.load(
+                        conn=conn, table=table, data=data.iloc[start:stop]
+                    )
+                    if chunked.loaded(rowcount=rowcount):
+                        conn.commit()
+                        chunked.commit()
+                except Exception as exc:
+                    conn.rollback()
+                    raise chunked.fail(error=exc) from exc
+
+        return chunked.result
+
+    def _write_partition(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        start: int,
+        stop: int,
+        method: str,
+        retries: int,
+    ):
+        loader = self._get_loader(method=method)
+        partition = _PartitionWrite(start=start, stop=stop, retries=retries)
+
+        for _ in partition:
+            try:
+                with self.__engine.connect() as conn:
+                    rowcount = loader.load(
+                        conn=conn, table=table, data=data.iloc[start:stop]
+                    )
+                    conn.commit()
+            except Exception as exc:
+                partition.failed(error=exc)
+            else:
+                partition.succeeded(rowcount=rowcount)
+
+        return partition.result
+
+    def _get_staging_table(self, table: Table, columns: list) -> Table:
+        staging = saved_values[self.__dbtype]["staging"]
+
+        return Table(
+            staging["name"].format(table=table.name),
+            MetaData(),
+            *[
+                Column(column.name, column.type)
+                for column in table.columns
+                if column.name in columns
+            ],
+            prefixes=staging["prefixes"],
+        )
+
+    def _get_upsert_query(self, table: Table, staging: Table, key_columns: list):
+        queries = saved_values[self.__dbtype]["query"]
+        preparer = self.__engine.dialect.identifier_preparer
+
+        columns = [preparer.quote(column.name) for column in staging.columns]
+        keys = [preparer.quote(column) for column in key_columns]
+        update_columns = [
+            preparer.quote(column.name)
+            for column in staging.columns
+            if column.name not in key_columns
+        ]
+
+        return queries["upsert"].format(
+            table=preparer.format_table(table),
+            staging=preparer.format_table(staging),
+            columns=", ".join(columns),
+            source_columns=", ".join(f"s.{column}" for column in columns),
+            keys=", ".join(keys),
+            conditions=" AND ".join(f"t.{key} = s.{key}" for key in keys),
+            updates=", ".join(
+                queries["upsert_update"].format(column=column)
+                for column in update_columns or keys
+            ),
+        )
+
+    def _prepare_upsert(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        key_columns: list,
+        chunksize: Optional[int] = None,
+    ):
+        data = data.drop_duplicates(subset=key_columns, keep="last")
+        staging = self._get_staging_table(table=table, columns=data.columns.tolist())
+        bounds = get_bounds(
+            num_rows=data.shape[0], size=chunksize or max(data.shape[0], 1)
+        )
+        upsert_query = self._get_upsert_query(
+            table=table, staging=staging, key_columns=key_columns
+        )
+        drop_query = saved_values[self.__dbtype]["query"]["drop_staging"].format(
+            staging=self.__engine.dialect.identifier_preparer.format_table(staging)
+        )
+
+        return data, staging, bounds, upsert_query, drop_query
+
+    def _upsert_data_to_table(
+        self,
+        data: pd.DataFrame,
+        table: Table,
+        key_columns: list,
+        chunksize: Optional[int] = None,
+        method: str = "executemany",
+    ):
+        data, staging, bounds, upsert_query, drop_query = self._prepare_upsert(
+            data=data, table=table, key_columns=key_columns, chunksize=chunksize
+        )
+        loader = self._get_loader(method=method)
+
+        with self.__engine.connect() as conn:
+            staging.create(bind=conn)
+            try:
+                for start, stop in bounds:
+                    loader.load(conn=conn, table=staging, data=data.iloc[start:stop])
+                result = conn.execute(text(upsert_query))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.exec_driver_sql(drop_query)
+                conn.commit()
+
+        return result
+
     def delete_table(self, table_name: str):
         """Drop table `table_name` from the current database if it exists.
 
@@ -235,6 +966,127 @@ class SQLDatabaseWriter:
             conn.execute(text(query))
             conn.commit()
 
+        self.invalidate_schema_cache(table_name=table_name)
+
+    def _check_if_exists(
+        self,
+        data: pd.DataFrame,
+        id_col: str,
+        clean_columns: bool,
+        if_exists: str,
+        key_columns: Optional[list] = None,
+    ) -> None:
+        if if_exists not in ["append", "replace", "upsert"]:
+            raise ValueError(f"{if_exists} not in ['append', 'replace', 'upsert']")
+        if if_exists != "upsert":
+            return
+
+        if not key_columns:
+            raise ValueError("`key_columns` are required to upsert")
+        columns = data.columns.tolist()
+        if clean_columns:
+            columns = [self._clean_column(column) for column in columns]
+        missing = [
+            column
+            for column in key_columns
+            if column not in columns or column == id_col
+        ]
+        if missing:
+            raise ValueError(f"{missing} not in columns: {columns}")
+
+    def _check_write(
+        self,
+        data: pd.DataFrame,
+        id_col: str,
+        clean_columns: bool,
+        if_exists: str,
+        key_columns: Optional[list],
+        drop_first: bool,
+        method: str,
+    ) -> bool:
+        self._check_if_exists(
+            data=data,
+            id_col=id_col,
+            clean_columns=clean_columns,
+            if_exists=if_exists,
+            key_columns=key_columns,
+        )
+        self._get_loader(method=method)
+
+        return drop_first or if_exists == "replace"
+
+    def _get_partitions(
+        self, num_rows: int, workers: int, chunksize: Optional[int], retries: int
+    ) -> list:
+        if workers < 1:
+            raise ValueError(f"`workers` must be positive, got {workers}")
+        if retries < 0:
+            raise ValueError(f"`retries` must not be negative, got {retries}")
+
+        if not chunksize:
+            chunksize = max(-(-num_rows // workers), 1)
+
+        return get_bounds(num_rows=num_rows, size=chunksize)
+
+    def _get_write_table(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        id_col: str,
+        clean_columns: bool,
+        max_length: int,
+        unique_columns: Optional[list] = None,
+    ):
+        if id_col and len(id_col) > 0 and (id_col in data.columns):
+            data = data.drop(id_col, axis=1)
+
+        if clean_columns:
+            data = self._clean_columns(data=data)
+
+        null_counts = self._get_null_counts(data=data)
+        table = self._get_table_from_dataframe(
+            data=data,
+            table_name=table_name,
+            id_col=id_col,
+            max_length=max_length,
+            null_counts=null_counts,
+            unique_columns=unique_columns,
+        )
+
+        return data, table, null_counts
+
+    def _prepare_write(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        id_col: str,
+        drop_first: bool,
+        clean_columns: bool,
+        max_length: int,
+        unique_columns: Optional[list] = None,
+    ):
+        self._ensure_database()
+
+        data, table, null_counts = self._get_write_table(
+            data=data,
+            table_name=table_name,
+            id_col=id_col,
+            clean_columns=clean_columns,
+            max_length=max_length,
+            unique_columns=unique_columns,
+        )
+
+        if drop_first:
+            self.delete_table(table_name=table_name)
+
+        table = self._create_new_table(table=table)
+        info = self.get_column_info(table_name=table_name)
+        data = self._check_null(
+            data=data, info=info, id_col=id_col, null_counts=null_counts
+        )
+
+        return data, table
+
     def write_df_to_db(
         self,
         data: pd.DataFrame,
@@ -243,6 +1095,11 @@ class SQLDatabaseWriter:
         drop_first: bool = False,
         clean_columns: bool = True,
         max_length: int = 100,
+        chunksize: Optional[int] = None,
+        commit_every: int = 1,
+        method: str = "executemany",
+        if_exists: str = "append",
+        key_columns: Optional[list] = None,
     ):
         """Write `data` to Table `table_name`
 
@@ -262,36 +1119,170 @@ class SQLDatabaseWriter:
         :type clean_columns: `bool`
         :param max_length: Maximum length of VARCHAR type columns, defaults to 100.
         :type max_length: `int`
+        :param chunksize: If set, write `data` in slices of `chunksize` rows,
+            each as its own executemany batch, defaults to None.
+        :type chunksize: `int`, optional
+        :param commit_every: Commit after this many chunks, defaults to 1.
+            Only used with `chunksize`.
+        :type commit_every: `int`, optional
+        :param method: How rows are sent to the server, defaults to "executemany".
+            "native" uses the bulk loader of the database: COPY for postgresql,
+            LOAD DATA LOCAL INFILE for mysql, which needs `local_infile=True`,
+            and bulk copy for sqlserver.
+        :type method: `str`, optional
+        :param if_exists: What to do with the rows already in `table_name`,
+            defaults to "append". "replace" is the same as `drop_first`.
+            "upsert" loads `data` into a temporary staging table first and then
+            inserts new rows and updates existing ones in a single statement:
+            ``INSERT ... ON CONFLICT`` for postgresql, ``ON DUPLICATE KEY UPDATE``
+            for mysql and ``MERGE`` for sqlserver.
+        :type if_exists: `str`, optional
+        :param key_columns: Columns identifying a row, required for "upsert".
+            New tables get a unique constraint on them. Existing tables must already
+            have a unique constraint or primary key on exactly these columns.
+            If a key appears more than once in `data`, the last row is used.
+        :type key_columns: `list`, optional
+        :raises ValueError: If `if_exists` is unknown or `key_columns` are missing.
+        :raises ChunkWriteError: If a chunk fails with `chunksize` or another `method`.
+            It holds the `WriteResult` so far and how many chunks were committed.
         :return: Cursor with result of query execution.
-        :rtype: `sqlalchemy.engine.cursor.CursorResult`
+            With `chunksize` or another `method`, per-chunk row counts and timings.
+        :rtype: `sqlalchemy.engine.cursor.CursorResult` or `WriteResult`
         """
 
-        if id_col and len(id_col) > 0 and (id_col in data.columns):
-            data = data.drop(id_col, axis=1)
-
-        if clean_columns:
-            data = self._clean_columns(data=data)
-
-        data = data.astype(object).where(pd.notnull(data), None)  # type: ignore
+        drop_first = self._check_write(
+            data=data,
+            id_col=id_col,
+            clean_columns=clean_columns,
+            if_exists=if_exists,
+            key_columns=key_columns,
+            drop_first=drop_first,
+            method=method,
+        )
 
-        table = self._get_table_from_dataframe(
+        data, table = self._prepare_write(
             data=data,
             table_name=table_name,
             id_col=id_col,
+            drop_first=drop_first,
+            clean_columns=clean_columns,
             max_length=max_length,
+            unique_columns=key_columns if if_exists == "upsert" else None,
         )
 
-        if drop_first:
-            self.delete_table(table_name=table_name)
+        if if_exists == "upsert":
+            return self._upsert_data_to_table(
+                data=data,
+                table=table,
+                key_columns=key_columns,
+                chunksize=chunksize,
+                method=method,
+            )
+
+        if chunksize or method != "executemany":
+            return self._write_data_in_chunks(
+                data=data,
+                table=table,
+                chunksize=chunksize or max(data.shape[0], 1),
+                commit_every=commit_every,
+                method=method,
+            )
 
-        table = self._create_new_table(table=table)
-        info = self.get_column_info(table_name=table_name)
-        data = self._check_null(data=data, info=info, id_col=id_col)
         result = self._write_data_to_table(data=data, table=table)
 
         return result
 
+    def parallel_write_df_to_db(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        workers: int = 4,
+        chunksize: Optional[int] = None,
+        id_col: str = "id",
+        drop_first: bool = False,
+        clean_columns: bool = True,
+        max_length: int = 100,
+        method: str = "executemany",
+        retries: int = 2,
+        max_pending: Optional[int] = None,
+    ):
+        """Write `data` to Table `table_name` over several connections at once.
+        The table is created once, then row ranges of `data` are written
+        concurrently by `workers` threads, each partition in its own transaction.
+        Connections come from the pool of the engine, so `workers` should not
+        exceed its pool size plus overflow.
+
+        :param data: Pandas dataframe containing data to write.
+        :type data: `pd.DataFrame`
+        :param table_name: Name of table in the database.
+        :type table_name: `str`
+        :param workers: Number of concurrent writers, defaults to 4.
+        :type workers: `int`, optional
+        :param chunksize: Rows per partition, defaults to an even split
+            of `data` over `workers`.
+        :type chunksize: `int`, optional
+        :param id_col: Id column of table if exists, defaults to "id".
+            Should be set to `None` if not present in data.
+        :type id_col: `str`, optional
+        :param drop_first: If True, table `table_name` in database will be attempted to drop first.
+        :type drop_first: `bool`
+        :param clean_columns: If True, trailing/leading whitespaces and " will be stripped
+            off column names, defaults to "True".
+        :type clean_columns: `bool`
+        :param max_length: Maximum length of VARCHAR type columns, defaults to 100.
+        :type max_length: `int`
+        :param method: How rows are sent to the server, defaults to "executemany".
+            See `write_df_to_db`.
+        :type method: `str`, optional
+        :param retries: Number of times a failed partition is retried, defaults to 2.
+        :type retries: `int`, optional
+        :param max_pending: Maximum number of partitions queued or running at once,
+            defaults to twice `workers`.
+        :type max_pending: `int`, optional
+        :return: Per-partition row counts, timings, attempts and errors.
+            Partitions that failed after all retries are listed in `failed`.
+        :rtype: `WriteResult`
+        """
+
+        partitions = self._get_partitions(
+            num_rows=data.shape[0],
+            workers=workers,
+            chunksize=chunksize,
+            retries=retries,
+        )
+        self._get_loader(method=method)
+
+        data, table = self._prepare_write(
+            data=data,
+            table_name=table_name,
+            id_col=id_col,
+            drop_first=drop_first,
+            clean_columns=clean_columns,
+            max_length=max_length,
+        )
+
+        chunks = bounded_map(
+            func=lambda partition: self._write_partition(
+                data=data,
+                table=table,
+                start=partition[0],
+                stop=partition[1],
+                method=method,
+                retries=retries,
+            ),
+            items=partitions,
+            workers=workers,
+            max_pending=max_pending or 2 * workers,
+        )
+
+        return WriteResult(chunks=sorted(chunks, key=lambda chunk: chunk.start))
+
     def close_connection(self):
-        """Close the current connection to the database"""
+        """Close the current connection to the database.
+        A shared engine is only disposed when no other writer holds it.
+        """
 
-        self.__engine.dispose()
+        if self.__shared:
+            registry.release(self.__engine)
+        else:
+            self.__engine.dispose()
@@ -3,8 +3,10 @@
 import pandas as pd
 import pytest
 from pd_extras.check.sanitize import (
+    check_column_collisions,
     check_if_column_exists,
     check_if_columns_exist,
+    clean_column,
     clean_column_names,
 )
 
@@ -34,3 +36,42 @@ class TestSanitize:
             for char in column:
                 assert isinstance(char, str)
                 assert char.isalnum() is True
+
+    def test_clean_column(self) -> None:
+        """Test ``clean_column``"""
+
+        assert clean_column(column="Col 1!") == "col1"
+        assert clean_column(column="Col 1!", is_lower=False) == "Col1"
+        assert clean_column(column="Col 1!", default_char="_") == "col_1_"
+        assert clean_column(column="Col 1!") == "col1"
+
+    def test_clean_column_collisions(self) -> None:
+        """Test different columns with the same clean name are reported"""
+
+        data = pd.DataFrame(columns=["A b", "a_b", "c", "C!"])
+        with pytest.raises(ValueError, match="'ab': \\['A b', 'a_b'\\]"):
+            clean_column_names(data=data)
+
+        data = pd.DataFrame(columns=["A b", "c", "C!"])
+        res = clean_column_names(data=data, default_char="_")
+        assert res.columns.tolist() == ["a_b", "c", "c_"]
+
+        check_column_collisions(columns=["a", "a"], clean_columns=["a", "a"])
+
+    def test_check_if_columns_exist_reports_all(self) -> None:
+        """Test every missing column is reported and positions are returned"""
+
+        data = pd.DataFrame(columns=["a", "b", "c"])
+        with pytest.raises(ValueError, match="\\['x', 'y'\\]"):
+            check_if_columns_exist(columns=["x", "a", "y"], data=data)
+
+        positions = check_if_columns_exist(columns=["c", "a"], data=data)
+        assert positions.tolist() == [2, 0]
+
+        data = pd.DataFrame(columns=["a", "b", "a"])
+        positions = check_if_columns_exist(columns=["b"], data=data)
+        assert positions.tolist() == [1]
+
+        data.columns = ["b", "a", "c"]
+        positions = check_if_columns_exist(columns=["b"], data=data)
+        assert positions.tolist() == [0]
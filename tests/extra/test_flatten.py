@@ -1,8 +1,15 @@
 """Test flatten module"""
 
+import json
 from typing import Union
+from unittest import mock
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pd_extras.extra import flattener as flattener_module
 from pd_extras.extra.flattener import Flattener
 
 random_nested_data = {
@@ -65,3 +72,271 @@ def test_flatten_dataframe():
     _test_flat_data(num_rows_to_check=1, depth=1, data=data)
 
     _test_flat_data(num_rows_to_check=1, depth=0, data=data)
+
+
+def test_flatten_engines():
+    """Test both engines return the same dataframe"""
+
+    data = pd.DataFrame(
+        data=[
+            random_nested_data,
+            {"id": "0002", "batters": {"batter": []}, "topping": None},
+            {
+                "id": "0003",
+                "ppu": 1,
+                "batters": {"batter": [{"id": "1001", "size": {"w": 1}}]},
+                "topping": [{"id": "5001", "extra": [{"a": 1}, {"a": 2}]}],
+            },
+        ]
+    )
+    for num_rows_to_check in [1, 2, 3]:
+        for depth in [0, 1, 2, 3]:
+            for sep in [".", "_"]:
+                for item in [data, random_nested_data]:
+                    flat_data = [
+                        Flattener(
+                            num_rows_to_check=num_rows_to_check,
+                            depth=depth,
+                            sep=sep,
+                            engine=engine,
+                        ).flatten(data=item)
+                        for engine in ["pandas", "columnar"]
+                    ]
+                    pd.testing.assert_frame_equal(flat_data[0], flat_data[1])
+
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1, engine="unknown")
+
+
+def test_iter_flatten(tmp_path):
+    """Test flattening newline delimited JSON chunk by chunk"""
+
+    records = [
+        random_nested_data,
+        {"id": "0002", "type": "donut", "topping": []},
+        {"id": "0003", "ppu": 0.4, "topping": [{"id": "5001"}], "extra": 1},
+    ]
+    path = tmp_path / "records.ndjson"
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    flattener = Flattener(num_rows_to_check=1, depth=2)
+    schema = flattener.flatten(data=pd.DataFrame(data=records[:2])).columns
+
+    with path.open() as file:
+        sources = [str(path), file, iter(records)]
+        chunks_per_source = []
+        for source in sources:
+            with pytest.warns(UserWarning, match="extra"):
+                chunks_per_source.append(
+                    list(flattener.iter_flatten(source=source, chunksize=2))
+                )
+
+    for chunks in chunks_per_source:
+        assert len(chunks) == 2
+        for chunk in chunks:
+            assert chunk.columns.equals(schema)
+        assert "extra" not in chunks[1].columns
+        assert chunks[1]["topping.id"].tolist() == ["5001"]
+
+    with pytest.raises(ValueError):
+        next(flattener.iter_flatten(source=records, chunksize=0))
+
+
+def test_iter_flatten_columns():
+    """Test columns first seen in a later chunk"""
+
+    records = [{"id": 1, "s": None}, {"id": 2, "s": {"a": 1, "b": 2}}]
+    flattener = Flattener(num_rows_to_check=1, depth=1)
+
+    with pytest.warns(UserWarning, match="s.a"):
+        chunks = list(flattener.iter_flatten(source=records, chunksize=1))
+    assert chunks[1].columns.tolist() == ["id", "s"]
+
+    chunks = list(
+        flattener.iter_flatten(source=records, chunksize=1, columns=["id", "s.a"])
+    )
+    assert [chunk.columns.tolist() for chunk in chunks] == [["id", "s.a"]] * 2
+    assert chunks[0]["s.a"].isna().all()
+    assert chunks[1]["s.a"].tolist() == [1]
+
+    table = flattener.flatten_to_arrow(
+        source=records, chunksize=1, columns=["id", "s.a"]
+    )
+    assert table.column_names == ["id", "s.a"]
+
+
+def test_get_column_kinds():
+    """Test nested column detection, sampling and caching"""
+
+    data = pd.DataFrame()
+    data["a"] = np.arange(6)
+    data["b"] = ["x", "y", None, "z", "x", "y"]
+    data["c"] = [{"d": 1}] * 6
+    data["e"] = [[{"f": 1}], [], [{"f": 2}], None, [{"f": 3}], [1]]
+    data["g"] = [[1, 2]] * 3 + [{"h": 1}] * 3
+
+    for sampling in ["head", "random", "stratified"]:
+        flattener = Flattener(num_rows_to_check=6, sampling=sampling, random_state=0)
+        assert flattener.get_column_kinds(data=data) == [
+            None,
+            None,
+            "dict",
+            "list",
+            "dict",
+        ]
+        assert flattener.get_column_info(data=data) == [
+            False,
+            False,
+            True,
+            True,
+            True,
+        ]
+
+    flattener = Flattener(num_rows_to_check=3)
+    assert flattener.get_column_kinds(data=data)[-1] is None
+    assert flattener.get_column_kinds(data=data.iloc[::-1])[-1] == "dict"
+
+    flattener = Flattener(num_rows_to_check=3, cache_kinds=True)
+    assert flattener.get_column_kinds(data=data)[-1] is None
+    assert flattener.get_column_kinds(data=data.iloc[::-1])[-1] is None
+
+    flattener = Flattener(num_rows_to_check=2, sampling="stratified", random_state=0)
+    assert flattener.get_column_kinds(data=data)[2:4] == ["dict", "list"]
+
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1, sampling="unknown")
+
+
+def test_flattener_reuse():
+    """Test one flattener on frames with the same schema but other values"""
+
+    nested = pd.DataFrame(data={"id": [1, 2], "x": [[{"a": 1}], [{"a": 2}]]})
+    flat = pd.DataFrame(data={"id": [1, 2], "x": ["foo", "bar"]})
+
+    for engine in ["pandas", "columnar"]:
+        flattener = Flattener(num_rows_to_check=2, depth=1, engine=engine)
+        assert flattener.flatten(data=nested)["x.a"].tolist() == [1, 2]
+        assert flattener.flatten(data=flat)["x"].tolist() == ["foo", "bar"]
+
+
+def test_parallel_flatten():
+    """Test flattening partitions in a process pool"""
+
+    data = pd.DataFrame(
+        data=[random_nested_data] * 5
+        + [{"id": "0002", "ppu": 1.5, "batters": {"batter": []}, "topping": None}] * 5
+    )
+    data["created"] = pd.date_range("2023-01-01", periods=10, freq="H")
+    data["point"] = [(idx, idx + 1) for idx in range(10)]
+    data["count"] = pd.array([1, None] * 5, dtype="Int64")
+    data["kind"] = pd.Categorical(["a", "b"] * 5)
+    data[1] = ["x", None] * 5
+
+    flat_data = Flattener(num_rows_to_check=1, depth=2).flatten(data=data)
+    with mock.patch.object(flattener_module.os, "cpu_count", return_value=4):
+        parallel_flat_data = Flattener(
+            num_rows_to_check=1, depth=2, n_jobs=3, min_partition_rows=1
+        ).flatten(data=data)
+    pd.testing.assert_frame_equal(flat_data, parallel_flat_data)
+    assert parallel_flat_data["point"].map(type).eq(tuple).all()
+
+    with mock.patch.object(flattener_module, "ProcessPoolExecutor") as executor:
+        serial_flat_data = Flattener(num_rows_to_check=1, depth=2, n_jobs=3).flatten(
+            data=data
+        )
+    executor.assert_not_called()
+    pd.testing.assert_frame_equal(flat_data, serial_flat_data)
+
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1, n_jobs=0)
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1, engine="pandas", n_jobs=2)
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1, min_partition_rows=0)
+
+
+def test_flatten_to_parquet(tmp_path):
+    """Test writing flattened chunks to Arrow and Parquet"""
+
+    data = pd.DataFrame(
+        data=[
+            {
+                "id": idx,
+                "note": None if idx < 4 else f"n{idx}",
+                "items": [{"sku": sku, "price": sku / 2} for sku in range(idx % 3)],
+            }
+            for idx in range(10)
+        ]
+    )
+    flattener = Flattener(num_rows_to_check=4)
+    flat_data = flattener.flatten(data=data)
+
+    table = flattener.flatten_to_arrow(source=data, chunksize=4)
+    assert table.num_rows == flat_data.shape[0]
+    assert table.column_names == flat_data.columns.tolist()
+    assert table.schema.field("id").type == pa.int64()
+    assert table.schema.field("items.price").type == pa.float64()
+    assert table.schema.field("note").type == pa.string()
+    assert table.column("note").to_pylist()[-1] == "n9"
+
+    path = tmp_path / "flat.parquet"
+    num_rows = flattener.flatten_to_parquet(source=data, path=path, row_group_size=4)
+    assert num_rows == flat_data.shape[0]
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_rows == flat_data.shape[0]
+    assert metadata.num_row_groups > 1
+    for idx in range(metadata.num_row_groups):
+        assert metadata.row_group(idx).num_rows <= 4
+    assert pq.read_table(path).equals(table)
+
+
+def test_flatten_to_tables():
+    """Test normalizing nested arrays into linked child tables"""
+
+    data = pd.DataFrame(
+        data=[
+            {"id": "0002", "topping": [{"id": "5001", "extra": [{"a": 1}, {"a": 2}]}]},
+            random_nested_data,
+        ]
+    )
+    tables = Flattener(num_rows_to_check=2, depth=2).flatten_to_tables(data=data)
+    assert list(tables.keys()) == [
+        "root",
+        "topping",
+        "topping.extra",
+        "batters.batter",
+    ]
+
+    root = tables["root"]
+    assert root["__row_id"].tolist() == [0, 1]
+    assert "topping" not in root.columns
+
+    topping = tables["topping"]
+    assert topping.shape[0] == len(random_nested_data["topping"]) + 1
+    assert topping["__parent_row_id"].tolist() == [0] + [1] * 7
+    assert tables["batters.batter"]["__parent_row_id"].tolist() == [1] * 4
+    assert tables["topping.extra"]["__parent_row_id"].tolist() == [0, 0]
+    assert tables["topping.extra"]["a"].tolist() == [1, 2]
+
+    tables = Flattener(num_rows_to_check=1, depth=0).flatten_to_tables(
+        data=random_nested_data
+    )
+    assert list(tables.keys()) == ["root"]
+    assert "batters.batter" in tables["root"].columns
+
+    documents = pd.DataFrame(
+        data=[
+            {"_id": "a", "items": [{"_id": 1}, {"_id": 2}]},
+            {"_id": "b", "items": [{"_id": 3}]},
+        ]
+    )
+    tables = Flattener(num_rows_to_check=2).flatten_to_tables(data=documents)
+    assert tables["root"]["_id"].tolist() == ["a", "b"]
+    assert tables["items"]["_id"].tolist() == [1, 2, 3]
+    assert tables["items"]["__parent_row_id"].tolist() == [0, 0, 1]
+
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1).flatten_to_tables(data=data, key="id")
+    with pytest.raises(ValueError):
+        Flattener(num_rows_to_check=1).flatten_to_tables(data=documents, key="_id")
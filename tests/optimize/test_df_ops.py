@@ -2,6 +2,7 @@
 
 import numpy as np
 import pandas as pd
+import pytest
 from pd_extras.optimize.df_ops import get_rows, select_columns_from_dataframe
 
 
@@ -31,3 +32,36 @@ class TestDfOps:
         assert rows.shape[1] == 3
 
         assert np.array_equal(data[columns].to_numpy(), rows) is True
+
+    def test_select_columns_view(self) -> None:
+        """Test evenly spaced columns of a single block are not copied"""
+
+        data = pd.DataFrame(np.arange(20.0).reshape(4, 5), columns=list("abcde"))
+
+        res = select_columns_from_dataframe(data=data, columns=["e", "c", "a"])
+        assert res.columns.tolist() == ["e", "c", "a"]
+        assert np.shares_memory(res.to_numpy(), data.to_numpy())
+
+        res = select_columns_from_dataframe(data=data, columns=["a", "b", "d"])
+        assert np.array_equal(res.to_numpy(), data[["a", "b", "d"]].to_numpy())
+
+        with pytest.raises(ValueError, match="\\['x', 'y'\\]"):
+            select_columns_from_dataframe(data=data, columns=["x", "a", "y"])
+
+    def test_get_rows_layouts(self) -> None:
+        """Test ``get_rows`` with typed layouts"""
+
+        data = pd.DataFrame({"a": [1, 2], "b": [0.5, 1.5], "c": ["x", "y"]})
+
+        rows = get_rows(data=data, columns=["c", "a"], layout="records")
+        assert rows.dtype.names == ("c", "a")
+        assert rows["a"].dtype == np.int64
+        assert rows[1].tolist() == ("y", 2)
+
+        rows = get_rows(data=data, columns=["c", "a"], layout="columns")
+        assert [column.dtype for column in rows] == [np.dtype("O"), np.int64]
+        assert np.shares_memory(rows[1], data["a"].to_numpy())
+        assert list(zip(*rows)) == [("x", 1), ("y", 2)]
+
+        with pytest.raises(ValueError):
+            get_rows(data=data, columns=["a"], layout="unknown")
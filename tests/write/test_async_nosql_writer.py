@@ -0,0 +1,98 @@
+"""Test AsyncNoSQLDatabaseWriter Class"""
+
+import asyncio
+import os
+
+import pandas as pd
+import pytest
+from pd_extras.write.async_nosql_writer import AsyncNoSQLDatabaseWriter
+from pd_extras.write.nosql_writer import BatchWriteResult
+
+pytest.importorskip("motor")
+
+DBNAME = "_async_testdb_"
+
+
+def _run(test):
+    """Run `test` with a new writer on a new event loop."""
+
+    async def _main():
+        conn = AsyncNoSQLDatabaseWriter(
+            dbtype="mongo",
+            host=os.environ["MONGO_HOST"],
+            dbname=DBNAME,
+            user=os.environ["MONGO_USER"],
+            password=os.environ["MONGO_PASSWORD"],
+            port=int(os.environ["MONGO_PORT"]),
+            dns_seed_list=True,
+        )
+        try:
+            await test(conn)
+        finally:
+            await conn.close_connection()
+
+    asyncio.run(_main())
+
+
+def test_write_and_read_collection(data: pd.DataFrame):
+    """Test writing batches concurrently and reading them back"""
+
+    collection_name = "_test_collection_"
+    batch_size = 10
+
+    async def _test(conn: AsyncNoSQLDatabaseWriter):
+        res = await conn.write_data_to_collection(
+            collection_name=collection_name,
+            data=data,
+            batch_size=batch_size,
+            workers=4,
+        )
+        assert isinstance(res, BatchWriteResult)
+        assert len(res.batches) == -(-data.shape[0] // batch_size)
+        assert res.inserted_count == data.shape[0]
+        assert collection_name in await conn.get_list_of_collections()
+
+        chunks = [
+            chunk
+            async for chunk in conn.read_collection(
+                collection_name=collection_name,
+                projection={"_id": 0, "city": 1},
+                batch_size=batch_size,
+            )
+        ]
+        assert sum(chunk.shape[0] for chunk in chunks) == data.shape[0]
+        for chunk in chunks:
+            assert chunk.shape[0] <= batch_size
+            assert chunk.columns.tolist() == ["city"]
+
+        await conn.delete_collection(collection_name=collection_name)
+
+    _run(test=_test)
+
+
+def test_upsert_to_collection(data: pd.DataFrame):
+    """Test upserting documents by key"""
+
+    collection_name = "_test_upsert_collection_"
+    data["key"] = list(range(data.shape[0]))
+    changed = data.iloc[:5].copy()
+    changed["city"] = "changed"
+
+    async def _test(conn: AsyncNoSQLDatabaseWriter):
+        res = await conn.write_data_to_collection(
+            collection_name=collection_name, data=data, mode="upsert", key=["key"]
+        )
+        assert res.inserted_count == data.shape[0]
+
+        res = await conn.write_data_to_collection(
+            collection_name=collection_name, data=changed, mode="upsert", key=["key"]
+        )
+        assert res.inserted_count == 0
+        assert res.matched_count == changed.shape[0]
+        count = await conn.get_document_count(collection_name=collection_name)
+        assert count == data.shape[0]
+
+        await conn.delete_database()
+        assert DBNAME not in await conn.get_list_of_databases()
+
+    _run(test=_test)
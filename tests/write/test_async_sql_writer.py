@@ -0,0 +1,216 @@
+"""Test asyncio dataframe to database module"""
+
+import asyncio
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from pd_extras.write.async_sql_writer import AsyncSQLDatabaseWriter
+from pd_extras.write.sql_writer import WriteResult
+
+pytest.importorskip("asyncpg")
+pytest.importorskip("aiomysql")
+
+DBNAME = "__test_db__"
+
+CREDENTIALS = {
+    dbtype: {
+        "host": os.environ[f"{prefix}_HOST"],
+        "user": os.environ[f"{prefix}_USER"],
+        "password": os.environ[f"{prefix}_PASSWORD"],
+        "port": int(os.environ[f"{prefix}_PORT"]),
+    }
+    for dbtype, prefix in [("mysql", "MYSQL"), ("postgresql", "POSTGRESQL")]
+}
+
+
+def _run(dbtype: str, test):
+    """Run `test` with a new writer on a new event loop.
+    Async connections belong to the loop that opened them.
+    """
+
+    async def _main():
+        conn = AsyncSQLDatabaseWriter(
+            dbtype=dbtype, dbname=DBNAME, **CREDENTIALS[dbtype]
+        )
+        try:
+            await test(conn)
+        finally:
+            await conn.close_connection()
+
+    asyncio.run(_main())
+
+
+def test_sqlserver_not_supported():
+    """Test unsupported database types are rejected"""
+
+    with pytest.raises(ValueError):
+        AsyncSQLDatabaseWriter(
+            dbtype="sqlserver", dbname=DBNAME, **CREDENTIALS["postgresql"]
+        )
+
+
+@pytest.mark.parametrize("dbtype", list(CREDENTIALS.keys()))
+class TestAsyncWriteToSQL:
+    """Test class for writing to SQL databases with asyncio"""
+
+    def test_write_and_read(self, dbtype: str, data: pd.DataFrame):
+        """Test writing dataframe and reading it back"""
+
+        table_name = "test__async__table__"
+
+        async def _test(conn: AsyncSQLDatabaseWriter):
+            result = await conn.write_df_to_db(
+                data=data, table_name=table_name, drop_first=True
+            )
+            assert result.rowcount == data.shape[0]
+            assert DBNAME in await conn.get_list_of_database()
+            assert await conn.has_table(table_name=table_name) is True
+
+            res = await conn.get_data_from_query(query=f"SELECT * FROM {table_name}")
+            assert res.shape == (data.shape[0], data.shape[1] + 1)
+
+            chunks = [
+                chunk
+                async for chunk in conn.iter_query(
+                    query=f"SELECT * FROM {table_name}",
+                    chunksize=10,
+                    dtypes={"latd": "float32"},
+                )
+            ]
+            assert sum(chunk.shape[0] for chunk in chunks) == data.shape[0]
+            assert chunks[0]["latd"].dtype == np.float32
+
+            table = await conn.get_arrow_from_query(
+                query=f"SELECT * FROM {table_name}", batch_size=10
+            )
+            assert isinstance(table, pa.Table)
+            assert table.num_rows == data.shape[0]
+
+            await conn.delete_table(table_name=table_name)
+            assert await conn.has_table(table_name=table_name) is False
+
+        _run(dbtype=dbtype, test=_test)
+
+    def test_parallel_write(self, dbtype: str, data: pd.DataFrame):
+        """Test writing dataframe partitions concurrently"""
+
+        table_name = "test__async__table__"
+
+        async def _test(conn: AsyncSQLDatabaseWriter):
+            result = await conn.parallel_write_df_to_db(
+                data=data,
+                table_name=table_name,
+                workers=3,
+                chunksize=10,
+                drop_first=True,
+                method="native" if dbtype == "postgresql" else "executemany",
+            )
+            assert isinstance(result, WriteResult)
+            assert result.failed == []
+            assert result.rowcount == data.shape[0]
+
+            res = await conn.get_data_from_query(
+                query=f"SELECT COUNT(*) FROM {table_name}"
+            )
+            assert res.iloc[0, 0] == data.shape[0]
+            await conn.delete_table(table_name=table_name)
+
+        _run(dbtype=dbtype, test=_test)
+
+    def test_upsert(self, dbtype: str, data: pd.DataFrame):
+        """Test upserting dataframe through a staging table"""
+
+        table_name = "test__async__table__"
+        data["key"] = np.arange(data.shape[0])
+        data["y"] = 0.0
+        changed = data.iloc[:5].copy()
+        changed["y"] = 1.0
+
+        async def _test(conn: AsyncSQLDatabaseWriter):
+            await conn.delete_table(table_name=table_name)
+            for frame in [data, changed]:
+                await conn.write_df_to_db(
+                    data=frame,
+                    table_name=table_name,
+                    if_exists="upsert",
+                    key_columns=["key"],
+                )
+
+            res = await conn.get_data_from_query(
+                query=f"SELECT COUNT(*), SUM(y) FROM {table_name}"
+            )
+            assert res.iloc[0, 0] == data.shape[0]
+            assert res.iloc[0, 1] == 5
+            await conn.delete_table(table_name=table_name)
+
+        _run(dbtype=dbtype, test=_test)
+
+    def test_cancel_write(self, dbtype: str, data: pd.DataFrame):
+        """Test a cancelled write leaves only whole committed chunks"""
+
+        table_name = "test__async__table__"
+        chunksize = 5
+
+        async def _test(conn: AsyncSQLDatabaseWriter):
+            await conn.write_df_to_db(
+                data=data.iloc[:chunksize], table_name=table_name, drop_first=True
+            )
+            task = asyncio.ensure_future(
+                conn.parallel_write_df_to_db(
+                    data=pd.concat([data] * 50),
+                    table_name=table_name,
+                    workers=2,
+                    chunksize=chunksize,
+                )
+            )
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            res = await conn.get_data_from_query(
+                query=f"SELECT COUNT(*) FROM {table_name}"
+            )
+            assert res.iloc[0, 0] % chunksize == 0
+            await conn.delete_table(table_name=table_name)
+
+        _run(dbtype=dbtype, test=_test)
+
+    def test_cancel_chunked_write(self, dbtype: str, data: pd.DataFrame):
+        """Test a cancelled chunked write leaves only whole commit groups"""
+
+        table_name = "test__async__table__"
+        chunksize = 5
+        commit_every = 4
+
+        async def _test(conn: AsyncSQLDatabaseWriter):
+            await conn.write_df_to_db(
+                data=data.iloc[:0],
+                table_name=table_name,
+                drop_first=True,
+                chunksize=chunksize,
+            )
+            task = asyncio.ensure_future(
+                conn.write_df_to_db(
+                    data=pd.concat([data] * 50),
+                    table_name=table_name,
+                    chunksize=chunksize,
+                    commit_every=commit_every,
+                    method="native" if dbtype == "postgresql" else "executemany",
+                )
+            )
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            res = await conn.get_data_from_query(
+                query=f"SELECT COUNT(*) FROM {table_name}"
+            )
+            assert res.iloc[0, 0] % (chunksize * commit_every) == 0
+            await conn.delete_table(table_name=table_name)
+
+        _run(dbtype=dbtype, test=_test)
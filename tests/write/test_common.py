@@ -0,0 +1,99 @@
+"""Test common module"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from pd_extras.write.common import async_bounded_map, bounded_map, run_to_completion
+
+
+def test_bounded_map():
+    """Test ``bounded_map`` keeps at most ``max_pending`` items in flight"""
+
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def _work(item: int) -> int:
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+
+        return item * 2
+
+    results = bounded_map(func=_work, items=range(20), workers=4, max_pending=3)
+
+    assert sorted(results) == [item * 2 for item in range(20)]
+    assert state["peak"] <= 3
+
+
+def test_async_bounded_map():
+    """Test ``async_bounded_map`` runs at most ``workers`` coroutines at once"""
+
+    state = {"running": 0, "peak": 0}
+
+    async def _work(item: int) -> int:
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.001)
+        state["running"] -= 1
+
+        return item * 2
+
+    results = asyncio.run(async_bounded_map(func=_work, items=range(20), workers=3))
+
+    assert sorted(results) == [item * 2 for item in range(20)]
+    assert state["peak"] == 3
+
+
+def test_async_bounded_map_cancel():
+    """Test cancelling ``async_bounded_map`` cancels the running coroutines"""
+
+    started = []
+    cancelled = []
+
+    async def _work(item: int) -> None:
+        started.append(item)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    async def _main():
+        task = asyncio.ensure_future(
+            async_bounded_map(func=_work, items=range(20), workers=4)
+        )
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_main())
+
+    assert sorted(started) == [0, 1, 2, 3]
+    assert sorted(cancelled) == started
+
+
+def test_run_to_completion():
+    """Test ``run_to_completion`` finishes its operation before cancelling"""
+
+    done = []
+
+    async def _commit() -> None:
+        await asyncio.sleep(0.02)
+        done.append(True)
+
+    async def _main():
+        task = asyncio.ensure_future(run_to_completion(_commit()))
+        await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_main())
+
+    assert done == [True]
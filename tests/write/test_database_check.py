@@ -0,0 +1,121 @@
+"""Test when ``SQLDatabaseWriter`` checks that its database exists"""
+
+from unittest import mock
+
+import pandas as pd
+import pytest
+from pd_extras.write import sql_writer
+from pd_extras.write.sql_writer import SQLDatabaseWriter
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateTable
+
+
+@pytest.fixture(scope="function")
+def patched():
+    """Patch engine creation and database checks of ``sql_writer``."""
+
+    with mock.patch.object(
+        sql_writer, "create_engine"
+    ) as create_engine, mock.patch.object(
+        sql_writer, "database_exists", return_value=False
+    ) as database_exists, mock.patch.object(
+        sql_writer, "create_database"
+    ) as create_database:
+        create_engine.side_effect = lambda url, **kwargs: mock.MagicMock(
+            url=make_url(url)
+        )
+        yield database_exists, create_database
+
+
+def _get_writer(dbname: str, **kwargs) -> SQLDatabaseWriter:
+    return SQLDatabaseWriter(
+        dbtype="postgresql",
+        host="localhost",
+        dbname=dbname,
+        user="user",
+        password="password",
+        port=5432,
+        **kwargs,
+    )
+
+
+def test_database_check_memoized(patched):
+    """Test the database is checked once per url"""
+
+    database_exists, create_database = patched
+
+    _get_writer(dbname="__memo_db__")
+    _get_writer(dbname="__memo_db__")
+
+    database_exists.assert_called_once()
+    create_database.assert_called_once()
+
+
+def test_database_check_lazy(patched):
+    """Test the check is deferred with ``lazy`` and skipped with ``assume_exists``"""
+
+    database_exists, _ = patched
+
+    writer = _get_writer(dbname="__lazy_db__", lazy=True)
+    database_exists.assert_not_called()
+    writer._ensure_database()
+    writer._ensure_database()
+    database_exists.assert_called_once()
+
+    writer = _get_writer(dbname="__assumed_db__", assume_exists=True)
+    writer._ensure_database()
+    database_exists.assert_called_once()
+
+
+def test_local_infile_opt_in(patched):
+    """Test LOAD DATA LOCAL INFILE is only enabled with ``local_infile``"""
+
+    credentials = {
+        "dbtype": "mysql",
+        "host": "localhost",
+        "dbname": "__infile_db__",
+        "user": "user",
+        "password": "password",
+        "port": 3306,
+    }
+
+    writer = SQLDatabaseWriter(**credentials)
+    assert sql_writer.create_engine.call_args[1]["connect_args"] == {}
+    with pytest.raises(ValueError):
+        writer._get_loader(method="native")
+    writer._get_loader(method="executemany")
+
+    writer = SQLDatabaseWriter(**credentials, local_infile=True)
+    assert sql_writer.create_engine.call_args[1]["connect_args"] == {"local_infile": 1}
+    writer._get_loader(method="native")
+
+
+def test_column_types(patched):
+    """Test column types are wide enough for the dataframe dtypes"""
+
+    writer = _get_writer(dbname="__types_db__", assume_exists=True)
+    frame = pd.DataFrame(
+        {
+            "small": pd.array([1], dtype="int16"),
+            "medium": pd.array([1], dtype="int32"),
+            "big": [2**31 + 1],
+            "u32": pd.array([2**31 + 1], dtype="uint32"),
+            "nullable": pd.array([2**31 + 1], dtype="Int64"),
+            "f32": pd.array([0.5], dtype="float32"),
+            "f64": [0.5],
+        }
+    )
+    table = writer._get_table_from_dataframe(data=frame, table_name="t", id_col="id")
+    ddl = str(CreateTable(table).compile(dialect=mysql.dialect()))
+
+    for column, column_type in [
+        ("small", "SMALLINT"),
+        ("medium", "INTEGER"),
+        ("big", "BIGINT"),
+        ("u32", "BIGINT"),
+        ("nullable", "BIGINT"),
+        ("f32", "FLOAT(24)"),
+        ("f64", "FLOAT(53)"),
+    ]:
+        assert f"{column} {column_type} NOT NULL" in ddl
@@ -0,0 +1,268 @@
+"""Test loaders module"""
+
+import asyncio
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from pd_extras.write.loaders import (
+    AsyncPostgresCopyLoader,
+    ExecuteManyLoader,
+    MySQLLoadDataLoader,
+    PostgresCopyLoader,
+    SQLServerBulkLoader,
+    get_loader,
+    to_records,
+    to_rows,
+)
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.dialects import mssql, mysql, postgresql
+
+
+@pytest.fixture(scope="function")
+def frame() -> pd.DataFrame:
+    """Small dataframe with a null value."""
+
+    return pd.DataFrame(
+        {
+            "a": [1, 2, 3],
+            "b": [0.5, None, 2.5],
+            "c": ["x", "y, z", "w"],
+        }
+    )
+
+
+def _get_table() -> Table:
+    return Table(
+        "test__table__",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("a", Integer),
+        Column("b", Float),
+        Column("c", String(10)),
+    )
+
+
+def _get_connection(dialect) -> mock.MagicMock:
+    conn = mock.MagicMock()
+    conn.dialect = dialect
+
+    return conn
+
+
+def test_get_loader():
+    """Test ``get_loader``"""
+
+    assert isinstance(get_loader(dbtype="mysql"), ExecuteManyLoader)
+    assert isinstance(
+        get_loader(dbtype="postgresql", method="native"), PostgresCopyLoader
+    )
+    assert isinstance(get_loader(dbtype="mysql", method="native"), MySQLLoadDataLoader)
+    assert isinstance(
+        get_loader(dbtype="sqlserver", method="native"), SQLServerBulkLoader
+    )
+
+    with pytest.raises(ValueError):
+        get_loader(dbtype="sqlite")
+    with pytest.raises(ValueError):
+        get_loader(dbtype="mysql", method="random_method")
+
+
+def test_execute_many_loader(frame: pd.DataFrame):
+    """Test ``ExecuteManyLoader`` against SQLite"""
+
+    table = _get_table()
+    engine = create_engine("sqlite://", future=True)
+    table.create(bind=engine)
+
+    with engine.connect() as conn:
+        rowcount = ExecuteManyLoader().load(conn=conn, table=table, data=frame)
+        conn.commit()
+
+        rows = conn.execute(table.select().order_by(table.c.id)).fetchall()
+
+    assert rowcount == frame.shape[0]
+    assert [row[1:] for row in rows] == [
+        (1, 0.5, "x"),
+        (2, None, "y, z"),
+        (3, 2.5, "w"),
+    ]
+    engine.dispose()
+
+
+def test_to_records(frame: pd.DataFrame):
+    """Test null conversion in ``to_records`` and ``to_rows``"""
+
+    frame["d"] = pd.to_datetime(["2023-01-01", None, "2023-01-03"])
+    records = to_records(data=frame)
+
+    assert records[1]["b"] is None
+    assert records[1]["d"] is None
+    assert isinstance(records[0]["a"], int)
+    assert isinstance(records[0]["b"], float)
+    assert list(to_rows(data=frame))[1][:3] == (2, None, "y, z")
+    assert frame["a"].dtype == np.int64
+    assert frame["b"].dtype == np.float64
+
+
+def test_to_records_extension_dtypes():
+    """Test extension dtypes without nulls are converted to Python scalars"""
+
+    data = pd.DataFrame(
+        {
+            "i": pd.array([1, 2], dtype="Int64"),
+            "f": pd.array([0.5, 1.5], dtype="Float64"),
+            "b": pd.array([True, False], dtype="boolean"),
+        }
+    )
+    types = [int, float, bool]
+
+    for record in to_records(data=data):
+        assert [type(value) for value in record.values()] == types
+    for row in to_rows(data=data):
+        assert [type(value) for value in row] == types
+
+
+def test_postgres_copy_loader(frame: pd.DataFrame):
+    """Test ``PostgresCopyLoader`` with a mocked cursor"""
+
+    conn = _get_connection(dialect=postgresql.dialect())
+    cursor = conn.connection.cursor.return_value
+    contents = []
+    cursor.copy_expert.side_effect = lambda query, buffer: contents.append(
+        buffer.read()
+    )
+    cursor.rowcount = frame.shape[0]
+
+    rowcount = PostgresCopyLoader().load(conn=conn, table=_get_table(), data=frame)
+
+    assert rowcount == frame.shape[0]
+    query = cursor.copy_expert.call_args[0][0]
+    assert query == "COPY test__table__ (a, b, c) FROM STDIN WITH (FORMAT text)"
+    assert contents == ["1\t0.5\tx\n2\t\\N\ty, z\n3\t2.5\tw\n"]
+    cursor.close.assert_called_once()
+
+
+def _parse_text_format(contents: str) -> list:
+    escapes = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+    rows = []
+    for line in contents.split("\n")[:-1]:
+        row = []
+        for field in line.split("\t"):
+            if field == "\\N":
+                row.append(None)
+                continue
+            value, chars = "", iter(field)
+            for char in chars:
+                value += escapes[next(chars)] if char == "\\" else char
+            row.append(value)
+        rows.append(tuple(row))
+
+    return rows
+
+
+@pytest.mark.parametrize("loader", [PostgresCopyLoader, MySQLLoadDataLoader])
+def test_native_loader_strings(loader):
+    """Test empty strings, "NULL" and escapes are not read back as null values"""
+
+    values = ["", "NULL", "\\N", None, "a\tb\nc\\d"]
+    frame = pd.DataFrame({"a": range(len(values)), "c": values})
+    frame.loc[1, "a"] = None
+
+    if loader is PostgresCopyLoader:
+        conn = _get_connection(dialect=postgresql.dialect())
+        contents = []
+        conn.connection.cursor.return_value.copy_expert.side_effect = (
+            lambda query, buffer: contents.append(buffer.read())
+        )
+    else:
+        conn = _get_connection(dialect=mysql.dialect())
+        contents = []
+
+        def _execute(query):
+            with open(query.split("'")[1], encoding="utf-8") as file:
+                contents.append(file.read())
+
+            return mock.MagicMock(rowcount=frame.shape[0])
+
+        conn.exec_driver_sql.side_effect = _execute
+
+    loader().load(conn=conn, table=_get_table(), data=frame)
+
+    rows = _parse_text_format(contents=contents[0])
+    assert [row[1] for row in rows] == values
+    assert rows[1][0] is None
+    assert frame["c"].tolist() == values
+
+
+def test_mysql_load_data_loader(frame: pd.DataFrame):
+    """Test ``MySQLLoadDataLoader`` with a mocked connection"""
+
+    conn = _get_connection(dialect=mysql.dialect())
+    contents = []
+
+    def _execute(query):
+        path = query.split("'")[1]
+        with open(path, encoding="utf-8") as file:
+            contents.append(file.read())
+        contents.append(path)
+
+        return mock.MagicMock(rowcount=frame.shape[0])
+
+    conn.exec_driver_sql.side_effect = _execute
+
+    frame["e"] = [True, False, True]
+    rowcount = MySQLLoadDataLoader().load(conn=conn, table=_get_table(), data=frame)
+
+    assert rowcount == frame.shape[0]
+    query = conn.exec_driver_sql.call_args[0][0]
+    assert query.startswith("LOAD DATA LOCAL INFILE")
+    assert query.endswith("(a, b, c, e)")
+    assert contents[0] == "1\t0.5\tx\t1\n2\t\\N\ty, z\t0\n3\t2.5\tw\t1\n"
+    assert not os.path.exists(contents[1])
+
+
+def test_sqlserver_bulk_loader(frame: pd.DataFrame):
+    """Test ``SQLServerBulkLoader`` with a mocked connection"""
+
+    conn = _get_connection(dialect=mssql.dialect())
+    bulk_copy = conn.connection.dbapi_connection.bulk_copy
+    rows = []
+    bulk_copy.side_effect = lambda table, elements, **kwargs: rows.extend(elements)
+
+    data = frame[["c", "a"]]
+    rowcount = SQLServerBulkLoader().load(conn=conn, table=_get_table(), data=data)
+
+    assert rowcount == data.shape[0]
+    assert bulk_copy.call_args[0][0] == "test__table__"
+    assert bulk_copy.call_args[1]["column_ids"] == [4, 2]
+    assert rows == [("x", 1), ("y, z", 2), ("w", 3)]
+    assert np.array_equal(np.array(rows, dtype=object), data.to_numpy())
+
+
+def test_async_postgres_copy_loader(frame: pd.DataFrame):
+    """Test ``AsyncPostgresCopyLoader`` with a mocked asyncpg connection"""
+
+    conn = mock.MagicMock()
+    conn.exec_driver_sql = mock.AsyncMock()
+    raw_connection = mock.MagicMock()
+    conn.get_raw_connection = mock.AsyncMock(return_value=raw_connection)
+    driver_connection = raw_connection.driver_connection
+    driver_connection.is_in_transaction.return_value = False
+    copy = driver_connection.copy_records_to_table
+    copy.side_effect = mock.AsyncMock(return_value="COPY 3")
+
+    loader = AsyncPostgresCopyLoader()
+    rowcount = asyncio.run(loader.load(conn=conn, table=_get_table(), data=frame))
+
+    assert rowcount == frame.shape[0]
+    conn.exec_driver_sql.assert_awaited_once()
+
+    driver_connection.is_in_transaction.return_value = True
+    asyncio.run(loader.load(conn=conn, table=_get_table(), data=frame))
+    conn.exec_driver_sql.assert_awaited_once()
+    assert copy.call_args[0][0] == "test__table__"
+    assert copy.call_args[1]["columns"] == ["a", "b", "c"]
+    assert copy.call_args[1]["records"][1] == (2, None, "y, z")
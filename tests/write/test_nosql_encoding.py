@@ -0,0 +1,61 @@
+"""Test document encoding in ``nosql_writer``"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from bson.raw_bson import RawBSONDocument
+from pd_extras.write.nosql_writer import encode_documents, encode_frame
+
+
+@pytest.fixture(scope="function")
+def frame() -> pd.DataFrame:
+    """Dataframe with a null value in every column but ``i``."""
+
+    return pd.DataFrame(
+        {
+            "i": np.arange(3),
+            "f": [0.5, np.nan, 2.5],
+            "d": pd.to_datetime(["2023-01-01", None, "2023-01-03"]),
+            "c": pd.Categorical(["x", None, "y"]),
+            "n": pd.array([1, None, 3], dtype="Int64"),
+        }
+    )
+
+
+def test_encode_frame(frame: pd.DataFrame):
+    """Test ``encode_frame``"""
+
+    documents = encode_frame(data=frame)
+
+    assert documents[0] == {
+        "i": 0,
+        "f": 0.5,
+        "d": datetime.datetime(2023, 1, 1),
+        "c": "x",
+        "n": 1,
+    }
+    for value in documents[0].values():
+        assert not isinstance(value, np.generic)
+    assert documents[1] == {"i": 1, "f": None, "d": None, "c": None, "n": None}
+
+    documents = encode_frame(data=frame, nulls="drop")
+    assert documents[1] == {"i": 1}
+
+    with pytest.raises(ValueError):
+        encode_frame(data=frame, nulls="nan")
+
+
+def test_encode_documents(frame: pd.DataFrame):
+    """Test ``encode_documents``"""
+
+    batches = list(encode_documents(data=frame, batch_size=2))
+    assert [len(documents) for documents in batches] == [2, 1]
+    assert batches[1] == encode_frame(data=frame.iloc[2:])
+
+    batches = list(encode_documents(data=frame, batch_size=2, raw_bson=True))
+    document = batches[0][0]
+    assert isinstance(document, RawBSONDocument)
+    assert "_id" in document
+    assert document["d"] == datetime.datetime(2023, 1, 1)
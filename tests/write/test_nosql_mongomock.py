@@ -0,0 +1,84 @@
+"""Test ``NoSQLDatabaseWriter`` writes against an in-memory Mongo client"""
+
+from unittest import mock
+
+import pandas as pd
+import pytest
+from pd_extras.write import nosql_writer
+from pd_extras.write.nosql_writer import NoSQLDatabaseWriter
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture(scope="function")
+def conn():
+    """Writer with ``pymongo.MongoClient`` replaced by ``mongomock``."""
+
+    with mock.patch.object(nosql_writer.pymongo, "MongoClient", mongomock.MongoClient):
+        conn = NoSQLDatabaseWriter(
+            dbtype="mongo",
+            host="localhost",
+            dbname="_testdb_",
+            user="user",
+            password="password",
+            port=27017,
+        )
+        yield conn
+        conn.close_connection()
+
+
+@pytest.mark.parametrize("mode", ["upsert", "replace"])
+def test_write_keeps_id(conn: NoSQLDatabaseWriter, mode: str):
+    """Test an ``_id`` in the data is kept for new and existing documents"""
+
+    collection_name = "_test_id_collection_"
+    data = pd.DataFrame({"_id": ["a", "b"], "key": [1, 2], "value": [1, 2]})
+
+    res = conn.write_data_to_collection(
+        collection_name=collection_name, data=data, mode=mode, key=["key"]
+    )
+    assert sorted(res.inserted_ids) == ["a", "b"]
+
+    data["value"] = [3, 4]
+    res = conn.write_data_to_collection(
+        collection_name=collection_name, data=data, mode=mode, key=["key"]
+    )
+    assert res.inserted_count == 0
+    assert res.failed == []
+
+    collection = conn.get_or_create_collection(collection_name=collection_name)
+    documents = list(collection.find({}, sort=[("key", 1)]))
+    assert [document["_id"] for document in documents] == ["a", "b"]
+    assert [document["value"] for document in documents] == [3, 4]
+
+
+def test_ordered_batches(conn: NoSQLDatabaseWriter):
+    """Test an ordered write stops at the first failed batch"""
+
+    collection_name = "_test_ordered_collection_"
+    data = pd.DataFrame({"_id": [f"id_{idx}" for idx in range(10)]})
+    data.at[3, "_id"] = data.at[2, "_id"]
+
+    res = conn.write_data_to_collection(
+        collection_name=collection_name, data=data, batch_size=2
+    )
+    assert [batch.start for batch in res.batches] == [0, 2]
+    assert res.inserted_count == 3
+    assert conn.get_document_count(collection_name=collection_name) == 3
+
+    with pytest.raises(ValueError):
+        conn.write_data_to_collection(
+            collection_name=collection_name,
+            data=data,
+            batch_size=2,
+            ordered=True,
+            workers=2,
+        )
+
+    conn.delete_collection(collection_name=collection_name)
+    res = conn.write_data_to_collection(
+        collection_name=collection_name, data=data, batch_size=2, workers=2
+    )
+    assert len(res.batches) == 5
+    assert res.inserted_count == 9
+    assert len(res.failed) == 1
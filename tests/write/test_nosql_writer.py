@@ -3,7 +3,7 @@
 import os
 
 import pandas as pd
-from pd_extras.write.nosql_writer import NoSQLDatabaseWriter
+from pd_extras.write.nosql_writer import BatchWriteResult, NoSQLDatabaseWriter
 from pymongo import results
 
 DBNAME = "_testdb_"
@@ -87,6 +87,94 @@ class TestNoSQLDatabaseWriter:
         collection_names = conn.get_list_of_collections()
         assert collection_name in collection_names
 
+    def test_write_in_batches(
+        self,
+        conn: NoSQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test writing data to collections in concurrent unordered batches."""
+
+        collection_name = "_test_collection_"
+        batch_size = 10
+
+        count_initial = conn.get_document_count(collection_name=collection_name)
+        data["_id"] = [f"batch_{idx}" for idx in range(data.shape[0])]
+        data.at[1, "_id"] = data.at[0, "_id"]
+
+        res = conn.write_data_to_collection(
+            collection_name=collection_name,
+            data=data,
+            batch_size=batch_size,
+            ordered=False,
+            workers=4,
+        )
+        assert isinstance(res, BatchWriteResult)
+        assert len(res.batches) == -(-data.shape[0] // batch_size)
+        assert res.inserted_count == data.shape[0] - 1
+        assert len(res.failed) == 1
+        assert res.failed[0].errors[0]["index"] == 1
+
+        count_new = conn.get_document_count(collection_name=collection_name)
+        assert count_new - count_initial == res.inserted_count
+
+    def test_upsert_to_collection(
+        self,
+        conn: NoSQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test upserting and replacing documents by key."""
+
+        collection_name = "_test_upsert_collection_"
+        data["key"] = list(range(data.shape[0]))
+
+        res = conn.write_data_to_collection(
+            collection_name=collection_name,
+            data=data,
+            mode="upsert",
+            key=["key"],
+            batch_size=10,
+            workers=2,
+        )
+        assert isinstance(res, BatchWriteResult)
+        assert res.inserted_count == data.shape[0]
+        assert res.failed == []
+
+        changed = data.iloc[:5].copy()
+        changed["city"] = "changed"
+        res = conn.write_data_to_collection(
+            collection_name=collection_name,
+            data=changed,
+            mode="replace",
+            key=["key"],
+        )
+        assert res.inserted_count == 0
+        assert res.matched_count == changed.shape[0]
+
+        collection = conn.get_or_create_collection(collection_name=collection_name)
+        assert conn.get_document_count(collection_name=collection_name) == data.shape[0]
+        assert collection.count_documents({"city": "changed"}) == changed.shape[0]
+        assert "key_1" in collection.index_information()
+        conn.delete_collection(collection_name=collection_name)
+
+    def test_read_collection(self, conn: NoSQLDatabaseWriter):
+        """Test reading a collection in chunks."""
+
+        collection_name = "_test_collection_"
+        count = conn.get_document_count(collection_name=collection_name)
+
+        chunks = list(
+            conn.read_collection(
+                collection_name=collection_name,
+                projection={"_id": 0, "city": 1, "state": 1},
+                batch_size=10,
+            )
+        )
+        assert sum(chunk.shape[0] for chunk in chunks) == count
+        for chunk in chunks:
+            assert isinstance(chunk, pd.DataFrame)
+            assert chunk.shape[0] <= 10
+            assert set(chunk.columns) == {"city", "state"}
+
     def test_delete_collection(self, conn: NoSQLDatabaseWriter):
         """Test collection dropping."""
 
@@ -5,7 +5,14 @@ import random
 
 import numpy as np
 import pandas as pd
-from pd_extras.write.sql_writer import SQLDatabaseWriter
+import pyarrow as pa
+import pytest
+from pd_extras.write.sql_writer import (
+    ChunkWriteError,
+    SQLDatabaseWriter,
+    WriteResult,
+    arrow_to_pandas,
+)
 from sqlalchemy.engine.cursor import CursorResult
 
 DBNAME = "__test_db__"
@@ -138,3 +145,279 @@ class TestWriteToSQL:
         assert isinstance(result, CursorResult)
         assert result.rowcount == data.shape[0]
         conn.delete_table(table_name=table_name)
+
+    def test_write_in_chunks(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test writing dataframe in fixed-size chunks"""
+
+        table_name = "test__table__"
+        chunksize = 7
+
+        result = conn.write_df_to_db(
+            data=data,
+            table_name=table_name,
+            drop_first=True,
+            chunksize=chunksize,
+            commit_every=2,
+        )
+        assert isinstance(result, WriteResult)
+        assert result.rowcount == data.shape[0]
+        assert len(result.chunks) == -(-data.shape[0] // chunksize)
+        for chunk in result.chunks:
+            assert chunk.stop - chunk.start <= chunksize
+            assert chunk.seconds >= 0
+
+        res = conn.get_data_from_query(query=f"SELECT COUNT(*) FROM {table_name}")
+        assert res.iloc[0, 0] == data.shape[0]
+        conn.delete_table(table_name=table_name)
+
+    def test_write_in_chunks_failure(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test a failed chunk reports the chunks committed before it"""
+
+        table_name = "test__table__"
+        data["key"] = np.arange(data.shape[0])
+
+        conn.delete_table(table_name=table_name)
+        conn.write_df_to_db(
+            data=data.iloc[:0],
+            table_name=table_name,
+            if_exists="upsert",
+            key_columns=["key"],
+        )
+        data.loc[25, "key"] = 0
+
+        with pytest.raises(ChunkWriteError) as error:
+            conn.write_df_to_db(data=data, table_name=table_name, chunksize=10)
+        assert error.value.index == 2
+        assert error.value.committed == 2
+        assert error.value.committed_rows == 20
+        assert error.value.result.chunks[2].error is not None
+
+        res = conn.get_data_from_query(query=f"SELECT COUNT(*) FROM {table_name}")
+        assert res.iloc[0, 0] == 20
+        conn.delete_table(table_name=table_name)
+
+    def test_write_native_strings(
+        self,
+        conn: SQLDatabaseWriter,
+    ):
+        """Test empty and "NULL" strings are not loaded as null values"""
+
+        table_name = "test__table__"
+        values = ["", "NULL", "\\N", None]
+        frame = pd.DataFrame({"k": range(len(values)), "s": values})
+
+        if conn is MYSQL_CONNECTION:
+            with pytest.raises(ValueError):
+                conn.write_df_to_db(data=frame, table_name=table_name, method="native")
+            return
+
+        conn.write_df_to_db(
+            data=frame, table_name=table_name, drop_first=True, method="native"
+        )
+        res = conn.get_data_from_query(query=f"SELECT k, s FROM {table_name}")
+        res = res.sort_values("k")
+        assert res["s"].tolist() == values
+        conn.delete_table(table_name=table_name)
+
+    def test_write_keeps_dtypes(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test table schema is inferred from the dataframe dtypes"""
+
+        table_name = "test__table__"
+        data["y"] = [random.random() for i in range(data.shape[0])]
+        data.at[0, "y"] = np.nan
+        dtypes = data.dtypes.copy()
+
+        result = conn.write_df_to_db(data=data, table_name=table_name, drop_first=True)
+        assert result.rowcount == data.shape[0]
+        assert data.dtypes.equals(dtypes)
+
+        info = conn.get_column_info(table_name=table_name)
+        data_types = dict(zip(info["column_name"], info["data_type"].str.lower()))
+        for column in data.select_dtypes("integer").columns:
+            assert "int" in data_types[column]
+        assert "char" not in data_types["y"]
+        conn.delete_table(table_name=table_name)
+
+    def test_write_wide_numbers(
+        self,
+        conn: SQLDatabaseWriter,
+    ):
+        """Test 64-bit integers and doubles are written without loss"""
+
+        table_name = "test__table__"
+        frame = pd.DataFrame(
+            {"k": [1, 2], "big": [2**31 + 1, 2**62], "x": [0.1234567891234, 1 / 3]}
+        )
+
+        conn.write_df_to_db(data=frame, table_name=table_name, drop_first=True)
+        res = conn.get_data_from_query(
+            query=f"SELECT k, big, x FROM {table_name} ORDER BY k"
+        )
+        assert res["big"].tolist() == frame["big"].tolist()
+        assert res["x"].astype(float).tolist() == frame["x"].tolist()
+        conn.delete_table(table_name=table_name)
+
+    def test_parallel_write(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test writing dataframe partitions concurrently"""
+
+        table_name = "test__table__"
+
+        result = conn.parallel_write_df_to_db(
+            data=data,
+            table_name=table_name,
+            workers=3,
+            chunksize=10,
+            drop_first=True,
+        )
+        assert isinstance(result, WriteResult)
+        assert result.failed == []
+        assert result.rowcount == data.shape[0]
+        starts = [chunk.start for chunk in result.chunks]
+        assert starts == sorted(starts)
+
+        res = conn.get_data_from_query(query=f"SELECT COUNT(*) FROM {table_name}")
+        assert res.iloc[0, 0] == data.shape[0]
+        conn.delete_table(table_name=table_name)
+
+    def test_schema_cache(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test schema lookups are cached and invalidated"""
+
+        table_name = "test__table__"
+        conn.write_df_to_db(data=data, table_name=table_name, drop_first=True)
+
+        hits = conn.schema_cache.hits
+        info = conn.get_column_info(table_name=table_name)
+        assert conn.get_column_info(table_name=table_name).equals(info)
+        assert conn.has_table(table_name=table_name) is True
+        assert conn.has_table(table_name=table_name) is True
+        assert conn.schema_cache.hits >= hits + 2
+
+        conn.delete_table(table_name=table_name)
+        assert conn.has_table(table_name=table_name) is False
+
+    def test_schema_cache_on_write(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test repeated writes to an existing table reuse the cached schema"""
+
+        table_name = "test__table__"
+        conn.write_df_to_db(data=data, table_name=table_name, drop_first=True)
+
+        hits, misses = conn.schema_cache.hits, conn.schema_cache.misses
+        for _ in range(3):
+            conn.write_df_to_db(data=data.iloc[:5], table_name=table_name)
+        assert conn.schema_cache.misses == misses
+        assert conn.schema_cache.hits == hits + 6
+
+        conn.delete_table(table_name=table_name)
+
+    def test_upsert(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test upserting dataframe through a staging table"""
+
+        table_name = "test__table__"
+        data["key"] = np.arange(data.shape[0])
+        data["y"] = 0.0
+
+        conn.delete_table(table_name=table_name)
+        conn.write_df_to_db(
+            data=data,
+            table_name=table_name,
+            if_exists="upsert",
+            key_columns=["key"],
+        )
+
+        changed = data.iloc[:5].copy()
+        changed["y"] = 1.0
+        new = data.iloc[:3].copy()
+        new["key"] = new["key"] + data.shape[0]
+        conn.write_df_to_db(
+            data=pd.concat([changed, new]),
+            table_name=table_name,
+            if_exists="upsert",
+            key_columns=["key"],
+            chunksize=4,
+        )
+
+        res = conn.get_data_from_query(
+            query=f"SELECT COUNT(*), SUM(y) FROM {table_name}"
+        )
+        assert res.iloc[0, 0] == data.shape[0] + 3
+        assert res.iloc[0, 1] == 5
+        conn.delete_table(table_name=table_name)
+
+    def test_iter_query(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test reading query results in chunks"""
+
+        table_name = "test__table__"
+        conn.write_df_to_db(data=data, table_name=table_name, drop_first=True)
+
+        chunksize = 10
+        chunks = list(
+            conn.iter_query(
+                query=f"SELECT * FROM {table_name}",
+                chunksize=chunksize,
+                dtypes={"latd": "float32"},
+            )
+        )
+        assert sum(chunk.shape[0] for chunk in chunks) == data.shape[0]
+        for chunk in chunks:
+            assert chunk.shape[0] <= chunksize
+            assert chunk["latd"].dtype == np.float32
+        conn.delete_table(table_name=table_name)
+
+    def test_arrow_from_query(
+        self,
+        conn: SQLDatabaseWriter,
+        data: pd.DataFrame,
+    ):
+        """Test reading query results as Arrow batches"""
+
+        table_name = "test__table__"
+        conn.write_df_to_db(data=data, table_name=table_name, drop_first=True)
+        query = f"SELECT * FROM {table_name}"
+
+        batches = list(conn.iter_arrow_batches(query=query, batch_size=10))
+        assert sum(batch.num_rows for batch in batches) == data.shape[0]
+        for batch in batches:
+            assert isinstance(batch, pa.RecordBatch)
+            assert batch.num_rows <= 10
+
+        table = conn.get_arrow_from_query(query=query)
+        assert isinstance(table, pa.Table)
+        assert table.num_rows == data.shape[0]
+
+        res = arrow_to_pandas(table=table)
+        assert res.shape == (data.shape[0], data.shape[1] + 1)
+        res = arrow_to_pandas(table=table, zero_copy=False)
+        assert res.columns.tolist() == table.column_names
+        conn.delete_table(table_name=table_name)